@@ -0,0 +1,127 @@
+# telesales/_common.py
+"""
+Pieces shared by the combined pipeline (telesales/pipeline.py) and the per-tier
+pipelines (tier_a/, non_a/): reading the Callers/Config tabs, resolving a tier's
+month file and writing a tier's day tab + Compile.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import pandas as pd
+
+from .io_gsheets import SheetsClient, SheetsInfo
+from .io_cache import read_tabs_cached
+from .constants import COL_ASSIGN_DATE
+from .utils import as_str_series, today_key, truthy_series
+
+
+@dataclass
+class TierWriteResult:
+    tier: str
+    file_name: str
+    tab_name: str
+    row_count: int
+    sheet_url: str
+    spreadsheet_id: str
+
+
+# ----------------------------- helpers ----------------------------------------
+
+def _header_map(df: pd.DataFrame) -> Dict[str, object]:
+    """{normalized header -> actual column} so sheet headers match case/space-insensitively."""
+    return {str(c).strip().lower(): c for c in df.columns}
+
+
+def _pick(cols: Dict[str, object], *names: str, default=None):
+    """First of `names` present in a _header_map, else `default`."""
+    for n in names:
+        if n in cols:
+            return cols[n]
+    return default
+
+
+def read_config_tabs(sc: SheetsClient, config_sheet_id: str | None, cache_ttl: int = 0) -> Dict[str, pd.DataFrame]:
+    """Callers + Config tabs of the config sheet, fetched together (one batchGet, disk-cached)."""
+    return read_tabs_cached(sc, config_sheet_id, ["Callers", "Config"], ttl_seconds=cache_ttl)
+
+
+def read_available_callers(df: pd.DataFrame | None) -> List[str]:
+    if df is None or df.empty:
+        print("[callers] Callers tab empty or missing → no assignment")
+        return []
+
+    cols = _header_map(df)
+    name_col = _pick(cols, "name", "caller", "telesale", default=df.columns[0])
+    avail_col = _pick(cols, "available", default="available")
+
+    if avail_col not in df.columns:
+        # No availability column: treat all names as available
+        names = as_str_series(df[name_col].dropna()).str.strip().tolist()
+        callers = [n for n in names if n]
+        print(f"[callers] No 'Available' column; using all: {callers}")
+        return callers
+
+    mask = truthy_series(df[avail_col])
+    names = as_str_series(df.loc[mask, name_col].dropna()).str.strip().tolist()
+    callers = [n for n in names if n]
+    print(f"[callers] Available callers: {callers}")
+    return callers
+
+
+def read_mix_weights(df: pd.DataFrame | None) -> dict[str, float]:
+    """Read {source_key -> mix_weight} from Config tab where enabled==TRUE, normalize to sum=1.0."""
+    if df is None or df.empty:
+        return {}
+
+    cols = _header_map(df)
+    sk_col = _pick(cols, "source_key", "source", default=df.columns[0])
+    en_col = _pick(cols, "enabled", default="enabled")
+    mw_col = _pick(cols, "mix_weight", default="mix_weight")
+
+    if en_col in df.columns:
+        df = df[truthy_series(df[en_col])]
+
+    if sk_col not in df.columns or mw_col not in df.columns:
+        return {}
+
+    # coerce mix_weight to numeric and drop non-positive
+    ww = pd.to_numeric(df[mw_col], errors="coerce")
+    df = df.assign(**{mw_col: ww}).dropna(subset=[mw_col])
+    df = df[df[mw_col] > 0]
+
+    weights = dict(zip(as_str_series(df[sk_col]).str.strip(), df[mw_col].astype(float)))
+    s = sum(weights.values())
+    return {k: v / s for k, v in weights.items()} if s > 0 else {}
+
+
+# ----------------------------- core write ops ---------------------------------
+
+def read_month_compile(sc: SheetsClient, tier_label: str) -> Tuple[SheetsInfo, pd.DataFrame]:
+    """(month file, this month's Compile tab) for a tier; Compile is empty on first run / dry-run."""
+    info: SheetsInfo = sc.find_or_create_month_file(tier_label)
+    return info, sc.read_tab_as_df(info.spreadsheet_id, "Compile")
+
+
+def write_tier(
+    sc: SheetsClient,
+    tier_label: str,
+    df: pd.DataFrame,
+    day_tab: str | None = None,
+    info: SheetsInfo | None = None,
+) -> TierWriteResult:
+    day_tab = day_tab or today_key()
+    # An empty tier is still written: it blanks the day tab and drops today's rows
+    # from Compile left by an earlier run. Callers skip the notification on row_count 0.
+    # reuse the month file resolved when Compile was read, if the caller has it
+    info = info or sc.find_or_create_month_file(tier_label)
+    # tabs (Compile first) + day tab + Compile go out in one batched write
+    sc.upsert_compile(info.spreadsheet_id, df, assign_date_col=COL_ASSIGN_DATE, day_tab=day_tab)
+    return TierWriteResult(
+        tier=tier_label,
+        file_name=info.title,
+        tab_name=day_tab,
+        row_count=len(df),
+        sheet_url=info.spreadsheet_url,
+        spreadsheet_id=info.spreadsheet_id,
+    )
@@ -17,14 +17,15 @@ Inputs:
   mix_weights: dict like {'cabal_pc_th': 0.5, 'cabal_mobile_th': 0.5}
 
 Output:
-  Returns a COPY of non_a_rows with a new column 'telesale' filled on assigned rows.
+  Returns a COPY of non_a_rows with a new column 'telesale' filled on assigned rows
+  (categorical over ["", *callers] when anything was assigned).
   Unassigned rows keep telesale="" so the pipeline can decide whether to drop them.
 """
 
 from __future__ import annotations
 
 from typing import Dict, List, Tuple
-import math
+import numpy as np
 import pandas as pd
 
 from .constants import SOURCE_PC, SOURCE_MOBILE
@@ -40,41 +41,91 @@ def _normalize_mix(mix: Dict[str, float]) -> Dict[str, float]:
     return {k: v / total for k, v in cleaned.items()}
 
 
-def _hamilton_apportion(total: int, weights: Dict[str, float]) -> Dict[str, int]:
+def _hamilton_np(weights: np.ndarray, total: int) -> np.ndarray:
     """
-    Hamilton (largest remainder) apportionment:
-    - base = floor(total * w_s) for each source s
-    - distribute remaining seats to largest remainders
+    Hamilton (largest remainder) apportionment on an ordered weight vector:
+    - base = floor(total * w) per entry
+    - remaining seats go to the largest remainders (ties -> earlier entry)
     """
+    ideal = total * weights
+    base = np.floor(ideal).astype(np.int64)
+    leftover = min(int(total - base.sum()), len(base))
+    if leftover > 0:
+        top = np.argsort(-(ideal - base), kind="stable")[:leftover]
+        base[top] += 1
+    return base
+
+
+def _hamilton_apportion(total: int, weights: Dict[str, float]) -> Dict[str, int]:
+    """Dict wrapper around _hamilton_np: {source -> weight} in, {source -> seats} out."""
     if total <= 0:
         return {k: 0 for k in weights.keys()}
-    base = {}
-    remainders = []
-    ssum = 0
-    for k, w in weights.items():
-        ideal = total * w
-        b = math.floor(ideal)
-        base[k] = b
-        ssum += b
-        remainders.append((k, ideal - b))
-    leftover = total - ssum
-    remainders.sort(key=lambda x: x[1], reverse=True)
-    i = 0
-    while leftover > 0 and i < len(remainders):
-        base[remainders[i][0]] += 1
-        leftover -= 1
-        i += 1
-    return base
+    keys = list(weights.keys())
+    w = np.fromiter(weights.values(), dtype=np.float64, count=len(keys))
+    return dict(zip(keys, _hamilton_np(w, int(total)).tolist()))
+
+
+def _plan_with_topups(
+    by_src: Dict[str, np.ndarray],
+    unknown_idx: np.ndarray,
+    quotas: Dict[str, int],
+    target: int,
+    k: int,
+) -> Tuple[np.ndarray, List[int]]:
+    """
+    Caller‑by‑caller plan used when some source bucket is short.
+    Returns (positions in caller order, rows taken per caller).
+    """
+    # Read cursor per bucket: rows before the cursor are already taken.
+    cursor: Dict[str, int] = {s: 0 for s in by_src}
+    unknown_cursor = 0
+
+    idx_parts: List[np.ndarray] = []
+    per_caller_counts: List[int] = []
+
+    for _ in range(k):
+        got = 0
+        # First pass: pull exactly the quota from each source (or as many as available)
+        for src_key, need in quotas.items():
+            if need <= 0:
+                continue
+            start = cursor[src_key]
+            block = by_src[src_key][start:start + need]
+            if len(block):
+                idx_parts.append(block)
+                cursor[src_key] = start + len(block)
+                got += len(block)
+
+        # If underfilled due to source shortage, top‑up from other sources.
+        # Prefer sources with most remaining rows to minimize skew.
+        short = target - got
+        if short > 0:
+            sources_by_left = sorted(
+                [(s, len(idx) - cursor[s]) for s, idx in by_src.items() if len(idx) - cursor[s] > 0],
+                key=lambda x: x[1],
+                reverse=True,
+            )
+            for src_key, _left in sources_by_left:
+                if short <= 0:
+                    break
+                start = cursor[src_key]
+                block = by_src[src_key][start:start + short]
+                idx_parts.append(block)
+                cursor[src_key] = start + len(block)
+                short -= len(block)
 
+        # Still short? Pull from unknown bucket, if any.
+        if short > 0 and unknown_cursor < len(unknown_idx):
+            block = unknown_idx[unknown_cursor:unknown_cursor + short]
+            idx_parts.append(block)
+            unknown_cursor += len(block)
+            short -= len(block)
 
-def _take_head(df: pd.DataFrame, n: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """Return (head, tail) without altering original index values."""
-    n = max(0, int(n))
-    if not isinstance(df, pd.DataFrame) or df.empty or n == 0:
-        return (df.head(0).copy() if isinstance(df, pd.DataFrame) else pd.DataFrame(), df.copy())
-    head = df.head(n).copy()
-    tail = df.iloc[len(head):].copy()
-    return head, tail
+        # Because we capped `target` to floor(total/k), every caller should hit it exactly.
+        per_caller_counts.append(target - short)
+
+    assign_pos = np.concatenate(idx_parts) if idx_parts else np.empty(0, dtype=np.intp)
+    return assign_pos, per_caller_counts
 
 
 def assign_mix_aware(
@@ -88,20 +139,28 @@ def assign_mix_aware(
 
     callers = [c for c in (callers or []) if str(c).strip()]
     if not callers:
-        out = non_a_rows.copy()
-        out["telesale"] = ""
-        return out
+        return non_a_rows.assign(telesale="")
 
-    # Buckets per source (stable order preserved via filtering)
+    # Buckets per source as positional index arrays (stable order preserved).
+    # We plan the whole assignment on integers and write the result once at the end,
+    # instead of slicing/copying a DataFrame per caller.
     weights = _normalize_mix(mix_weights)
-    by_src: Dict[str, pd.DataFrame] = {
-        s: non_a_rows[non_a_rows.get("source_key", "") == s].copy()
+    # Dictionary-encode source_key once (one hash pass); every bucket test below
+    # is then an int compare on the codes instead of a string compare per row.
+    if "source_key" in non_a_rows.columns:
+        codes, uniques = pd.factorize(non_a_rows["source_key"], use_na_sentinel=False)
+    else:
+        codes, uniques = np.zeros(len(non_a_rows), dtype=np.intp), pd.Index([""])
+    code_of = {u: i for i, u in enumerate(uniques)}
+    by_src: Dict[str, np.ndarray] = {
+        s: np.flatnonzero(codes == code_of[s]) if s in code_of else np.empty(0, dtype=np.intp)
         for s in weights.keys()
     }
-    # Unknown sources go to a top‑up bucket
-    unknown_df = non_a_rows[~non_a_rows.get("source_key", "").isin(weights.keys())].copy()
+    # Unknown sources go to a top‑up bucket (positions stay in original row order)
+    known_codes = [code_of[s] for s in weights.keys() if s in code_of]
+    unknown_idx = np.flatnonzero(~np.isin(codes, known_codes))
 
-    total_available = sum(len(df) for df in by_src.values()) + len(unknown_df)
+    total_available = sum(len(idx) for idx in by_src.values()) + len(unknown_idx)
     k = len(callers)
 
     # Make counts perfectly equal: cap target to floor(total / k)
@@ -109,70 +168,30 @@ def assign_mix_aware(
 
     # If target is 0, nothing to assign (better equal than skewed)
     if target <= 0:
-        out = non_a_rows.copy()
-        out["telesale"] = ""
-        return out
+        return non_a_rows.assign(telesale="")
 
-    # For each caller, compute per‑source quotas using Hamilton apportionment.
+    # Per‑source quotas via Hamilton apportionment. They are identical for every caller
+    # (same target, same weights), so compute them once.
     # This enforces the per‑caller mix (e.g., target=16, 50/50 => 8+8).
-    assigned_frames: List[pd.DataFrame] = []
-    remaining: Dict[str, pd.DataFrame] = {k: v.copy() for k, v in by_src.items()}
-
-    for caller in callers:
-        quotas = _hamilton_apportion(target, weights)
-
-        taken_parts: List[pd.DataFrame] = []
-        # First pass: pull exactly the quota from each source (or as many as available)
-        got = 0
-        for src, need in quotas.items():
-            if need <= 0:
-                continue
-            head, tail = _take_head(remaining.get(src, pd.DataFrame()), need)
-            if not head.empty:
-                head["telesale"] = caller
-                taken_parts.append(head)
-                got += len(head)
-                remaining[src] = tail
-
-        # If underfilled due to source shortage, top‑up from other sources proportionally
-        short = target - got
-        if short > 0:
-            # Try other known sources with remaining rows
-            # Prefer sources with most remaining rows to minimize skew.
-            sources_by_left = sorted(
-                [(s, len(df)) for s, df in remaining.items() if len(df) > 0],
-                key=lambda x: x[1],
-                reverse=True,
-            )
-            for src, _left in sources_by_left:
-                if short <= 0:
-                    break
-                add, tail2 = _take_head(remaining[src], short)
-                if not add.empty:
-                    add["telesale"] = caller
-                    taken_parts.append(add)
-                    short -= len(add)
-                    remaining[src] = tail2
-
-        # Still short? Pull from unknown bucket, if any.
-        if short > 0 and not unknown_df.empty:
-            add, unknown_df = _take_head(unknown_df, short)
-            if not add.empty:
-                add["telesale"] = caller
-                taken_parts.append(add)
-                short -= len(add)
-
-        # At this point, caller either has exactly `target` rows, or less if global capacity isn’t enough.
-        # But because we capped `target` to floor(total/k), we should hit exact targets for all callers.
-        if taken_parts:
-            assigned_frames.append(pd.concat(taken_parts, ignore_index=False))
-
-    # Build output: fill telesale for assigned indices; leave others empty
-    out = non_a_rows.copy()
-    out["telesale"] = ""
-    if assigned_frames:
-        assigned = pd.concat(assigned_frames, ignore_index=False)
-        # Align back to original indices
-        out.loc[assigned.index, "telesale"] = assigned["telesale"].values
-
-    return out
+    quotas = _hamilton_apportion(target, weights)
+
+    # telesale is written as a Categorical over ["", *callers]: each caller is an
+    # int code, so no per‑row string refs are allocated and groupbys run on codes.
+    categories = [""] + list(dict.fromkeys(callers))
+    caller_codes = np.array([categories.index(c) for c in callers], dtype=np.int32)
+    if sum(quotas.values()) == target and all(len(by_src[s]) >= k * q for s, q in quotas.items()):
+        # Fast path (no bucket is short): caller i simply gets the i‑th quota‑sized
+        # block of every source, i.e. one reshape per source — same plan as the loop.
+        blocks = [by_src[s][: k * q].reshape(k, q) for s, q in quotas.items()]
+        assign_pos = np.concatenate(blocks, axis=1).reshape(-1)
+        assign_code = np.repeat(caller_codes, target)
+    else:
+        assign_pos, per_caller_counts = _plan_with_topups(by_src, unknown_idx, quotas, target, k)
+        assign_code = np.repeat(caller_codes, per_caller_counts)
+
+    # Build output: fill telesale codes for assigned rows in one write; code 0 == ""
+    # The column is preallocated and attached with .assign(), so the caller's frame is
+    # left untouched and no per-row writes go through .loc.
+    tele_codes = np.zeros(len(non_a_rows), dtype=np.int32)
+    tele_codes[assign_pos] = assign_code
+    return non_a_rows.assign(telesale=pd.Categorical.from_codes(tele_codes, categories=categories))
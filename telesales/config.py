@@ -5,10 +5,12 @@ Loads environment variables and exposes a typed Config object.
 - Safe parsing for bools/ints (with defaults)
 - Gentle hints if critical keys are missing (no crashes)
 - Timezone normalization, integer clamping, absolute path helper
+- Config is frozen; load_config() is memoized per process (cache_clear() to reload)
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from typing import Optional, Dict, Any
 import os
 from pathlib import Path
@@ -17,11 +19,15 @@ from dotenv import load_dotenv
 
 # ------------------------- parsing helpers ------------------------------------
 
-_TRUE_SET = {"1", "true", "yes", "y", "on"}
+_TRUE_SET = frozenset({"1", "true", "yes", "y", "on"})
 def _as_bool(val: Optional[str], default: bool = False) -> bool:
+    # os.getenv gives str | None, so no str() wrapper needed
     if val is None:
         return default
-    return str(val).strip().lower() in _TRUE_SET
+    v = val.strip()
+    if not v:
+        return default
+    return v.lower() in _TRUE_SET
 
 def _as_int(val: Optional[str], default: int) -> int:
     try:
@@ -36,6 +42,7 @@ def _norm_tz(val: Optional[str]) -> str:
     # Keep it simple; your app uses Asia/Bangkok by default
     return (val or "Asia/Bangkok").strip()
 
+@lru_cache(maxsize=32)
 def _abs_path(p: Optional[str]) -> Optional[str]:
     if not p:
         return p
@@ -44,7 +51,7 @@ def _abs_path(p: Optional[str]) -> Optional[str]:
 
 # ------------------------- data model -----------------------------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     # Google / Sheets
     service_account_file: Optional[str]
@@ -58,6 +65,8 @@ class Config:
     audit_csv: bool = False
     strict_schema: bool = True
     app_timezone: str = "Asia/Bangkok"
+    config_cache_ttl: int = 900  # seconds; 0 disables the Config-sheet tab cache
+    folder_cache_ttl: int = 86400  # seconds; 0 disables the on-disk output-folder index
 
     # Data sources (DB)
     use_real_db: bool = False
@@ -118,17 +127,24 @@ class Config:
 
 # ------------------------- loader ---------------------------------------------
 
+@lru_cache(maxsize=1)
 def load_config() -> Config:
     # Load .env if present
     load_dotenv()
 
+    # Friendly clamps / normalization (Config is frozen, so do these up front)
+    unreachable_min_count = _clamp(_as_int(os.getenv("UNREACHABLE_MIN_COUNT"), 2), 1, 10)
+    config_cache_ttl = max(0, _as_int(os.getenv("CONFIG_CACHE_TTL"), 900))
+    folder_cache_ttl = max(0, _as_int(os.getenv("FOLDER_CACHE_TTL"), 86400))
+    output_prefix = os.getenv("OUTPUT_FILE_PREFIX", "CBTH") or "CBTH"
+
     # Raw env → parsed values
     cfg = Config(
         # Google / Sheets
         service_account_file=_abs_path(os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE")),
         config_sheet_id=os.getenv("CONFIG_SHEET_ID"),
         output_folder_id=os.getenv("OUTPUT_DRIVE_FOLDER_ID"),
-        output_prefix=os.getenv("OUTPUT_FILE_PREFIX", "CBTH"),
+        output_prefix=output_prefix,
 
         # App behavior
         per_caller_target=_as_int(os.getenv("PER_CALLER_TARGET"), 80),
@@ -136,6 +152,8 @@ def load_config() -> Config:
         audit_csv=_as_bool(os.getenv("AUDIT_CSV"), False),
         strict_schema=_as_bool(os.getenv("STRICT_SCHEMA"), True),
         app_timezone=_norm_tz(os.getenv("APP_TIMEZONE")),
+        config_cache_ttl=config_cache_ttl,
+        folder_cache_ttl=folder_cache_ttl,
 
         # Data sources (DB)
         use_real_db=_as_bool(os.getenv("USE_REAL_DB"), False),
@@ -147,7 +165,7 @@ def load_config() -> Config:
 
         # Drop toggles
         drop_unreachable_repeat=_as_bool(os.getenv("DROP_UNREACHABLE_REPEAT"), True),
-        unreachable_min_count=_as_int(os.getenv("UNREACHABLE_MIN_COUNT"), 2),
+        unreachable_min_count=unreachable_min_count,
         drop_answered_this_month=_as_bool(os.getenv("DROP_ANSWERED_THIS_MONTH"), True),
         drop_invalid_number=_as_bool(os.getenv("DROP_INVALID_NUMBER"), True),
         drop_not_interested_this_month=_as_bool(os.getenv("DROP_NOT_INTERESTED_THIS_MONTH"), True),
@@ -165,11 +183,6 @@ def load_config() -> Config:
         webhook_non_a=os.getenv("DISCORD_WEBHOOK_NON_A"),
     )
 
-    # Friendly clamps / normalization
-    cfg.unreachable_min_count = _clamp(cfg.unreachable_min_count, 1, 10)
-    if not cfg.output_prefix:
-        cfg.output_prefix = "CBTH"
-
     # Hints (don’t crash)
     cfg.hint_if_incomplete()
     cfg.hint_if_files_missing()
@@ -14,21 +14,30 @@ Config toggles are passed in explicitly so this module stays stateless/testable.
 
 from __future__ import annotations
 
-from typing import Iterable, Optional, Set, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
+import numpy as np
 import pandas as pd
 
+from .utils import as_str_series
+
 
 # ---- Thai status sets (as given) ---------------------------------------------
 
-UNREACHABLE_ANS_STATUSES = {
+UNREACHABLE_ANS_STATUSES = frozenset({
     "ไม่รับสาย",         # no answer
     "ติดต่อไม่ได้",       # cannot contact
     "กดตัดสาย",           # cut the call
     "รับสายไม่สะดวกคุย",  # answered but not convenient to talk
-}
+})
 
 ANSWERED_STATUS = "รับสาย"
 
+# Fixed categories for Compile "Answer Status": codes [0, N) are the unreachable
+# statuses, code N is "answered", -1 is anything else. One categorical encode
+# (get_indexer) then serves both Answer Status rules as int compares.
+_ANS_CATEGORIES = pd.Index([*sorted(UNREACHABLE_ANS_STATUSES), ANSWERED_STATUS])
+_ANSWERED_CODE = len(UNREACHABLE_ANS_STATUSES)
+
 RESULT_INVALID_NUMBER = "เบอร์เสีย"
 RESULT_NOT_INTERESTED = "ไม่สนใจ"
 RESULT_NOT_OWNER = "ไม่ใช่เจ้าของไอดี"
@@ -41,16 +50,56 @@ def _ensure_df(df: Optional[pd.DataFrame]) -> pd.DataFrame:
 
 
 def _safe_str_series(s: pd.Series) -> pd.Series:
-    return s.astype(str).fillna("")
+    return as_str_series(s).fillna("")
+
 
+def _first_col(df: pd.DataFrame, *names: str) -> pd.Series:
+    """First present column among names as str; "" per row when none exist."""
+    for name in names:
+        if name in df.columns:
+            return _safe_str_series(df[name])
+    return pd.Series("", index=df.index, dtype=object)
 
-def _triple_key(df: pd.DataFrame) -> pd.Series:
-    """(phone, username, source_key/platform) as a combined string key for fast matching."""
-    phone = _safe_str_series(df.get("phone", pd.Series()))
-    user = _safe_str_series(df.get("username", pd.Series()))
+
+def _triple_cols(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """(phone, username, source_key/platform) columns of a pool/blacklist frame."""
     # some code uses "platform", some "source_key" — try both
-    src = _safe_str_series(df.get("source_key", df.get("platform", pd.Series())))
-    return phone + "|" + user + "|" + src
+    return (
+        _first_col(df, "phone"),
+        _first_col(df, "username"),
+        _first_col(df, "source_key", "platform"),
+    )
+
+
+def _encode_triples(triples: List[Tuple[pd.Series, pd.Series, pd.Series]]) -> List[np.ndarray]:
+    """
+    Encode (phone, username, platform) triples from several frames as int64 keys
+    in ONE shared code space: equal triples get equal keys across frames.
+    Matching then hashes small ints instead of building and hashing
+    'phone|username|platform' strings. Keys are dense in [0, n_distinct).
+    """
+    sizes = [len(t[0]) for t in triples]
+    key: Optional[np.ndarray] = None
+    for part in range(3):
+        values = np.concatenate([t[part].to_numpy(dtype=object) for t in triples])
+        codes, uniques = pd.factorize(values)
+        if key is None:
+            key = codes.astype(np.int64)
+        else:
+            # re-factorize the pair so the next multiply stays far from int64 overflow
+            key, _ = pd.factorize(key * len(uniques) + codes)
+    return np.split(key.astype(np.int64), np.cumsum(sizes)[:-1])
+
+
+def tier_a_mask(df: pd.DataFrame) -> np.ndarray:
+    """
+    Column-wise constants.is_tier_a over df['tier'] as a plain bool array
+    (all False when the column is missing). Meant as apply_filters' base_mask.
+    """
+    df = _ensure_df(df)
+    if "tier" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return _safe_str_series(df["tier"]).str.strip().str.upper().str.startswith("A-").to_numpy(dtype=bool)
 
 
 # ---- main filter ---------------------------------------------------------------
@@ -61,6 +110,7 @@ def apply_filters(
     compile_df: Optional[pd.DataFrame] = None,
     blacklist_df: Optional[pd.DataFrame] = None,
     redeemed_usernames_today: Optional[Iterable[str]] = None,
+    base_mask: Optional[np.ndarray] = None,
     # toggles
     drop_unreachable_repeat: bool = True,
     unreachable_min_count: int = 2,
@@ -73,111 +123,93 @@ def apply_filters(
     """
     Returns a filtered copy of pool_df.
     All drops are applied with simple boolean masks; missing columns are treated as non-matching.
+    base_mask (positional, len(pool_df)) pre-selects rows, e.g. ~tier_a_mask(pool) for Non-A;
+    it is ANDed with the rules below so the pool is sliced only once.
     """
-    df = _ensure_df(pool_df).copy()
+    # No .copy(): the pool is only read here; the boolean selection at the end
+    # already returns a new frame.
+    df = _ensure_df(pool_df)
     if df.empty:
-        return df
+        return df.reset_index(drop=True)
 
     comp = _ensure_df(compile_df)
     bl = _ensure_df(blacklist_df)
     redeemed_set: Set[str] = set(redeemed_usernames_today or [])
 
-    keep = pd.Series(True, index=df.index)
+    # Plain ndarray mask: every stage below ANDs positional arrays, no index alignment.
+    keep = np.ones(len(df), dtype=bool) if base_mask is None else np.array(base_mask, dtype=bool)
+
+    # Nothing to filter against (dry-run, first run of the month, ...) -> skip the masks
+    has_result_rules = "Result" in df.columns and (drop_invalid_number or drop_not_owner_as_blacklist)
+    has_redeemed = drop_redeemed_today and bool(redeemed_set)
+    if bl.empty and comp.empty and not has_result_rules and not has_redeemed:
+        return df.reset_index(drop=True) if keep.all() else df.iloc[keep].reset_index(drop=True)
+
+    # Pool, blacklist and Compile keys share one int64 code space (see _encode_triples),
+    # so every triple match below is an int isin instead of a string one.
+    if not (bl.empty and comp.empty):
+        comp_triple = (
+            _first_col(comp, "Phone Number", "phone"),
+            _first_col(comp, "Username", "username"),
+            _first_col(comp, "platform", "source_key"),
+        )
+        pool_code, bl_code, comp_code = _encode_triples([_triple_cols(df), _triple_cols(bl), comp_triple])
 
     # --- Central blacklist (triple match) -------------------------------------
     if not bl.empty:
-        bl_key = _triple_key(bl).unique()
-        pool_key = _triple_key(df)
-        keep &= ~pool_key.isin(bl_key)
+        keep &= ~np.isin(pool_code, bl_code)
 
     # --- Compile-based rules (this month) -------------------------------------
     if not comp.empty:
         # normalize text cols
-        comp_ans = _safe_str_series(comp.get("Answer Status", pd.Series()))
-        comp_res = _safe_str_series(comp.get("Result", pd.Series()))
-        comp_user = _safe_str_series(comp.get("Username", comp.get("username", pd.Series())))
-        comp_phone = _safe_str_series(comp.get("Phone Number", comp.get("phone", pd.Series())))
-        comp_platform = _safe_str_series(comp.get("platform", comp.get("source_key", pd.Series())))
-
-        # Build a compact df to count by user+phone+platform this month
-        comp_min = pd.DataFrame({
-            "username": comp_user,
-            "phone": comp_phone,
-            "platform": comp_platform,
-            "ans": comp_ans,
-            "res": comp_res,
-        })
+        comp_ans = _first_col(comp, "Answer Status")
+        comp_res = _first_col(comp, "Result")
+
+        # One grouped pass over Compile collects every per-key rule at once:
+        # unreachable / answered / not-interested counts (this month). All three are
+        # summed (not any()) so the reindex below stays int64 instead of object.
+        ans_codes = _ANS_CATEGORIES.get_indexer(comp_ans)
+        stats = (
+            pd.DataFrame({
+                "unreach_cnt": (ans_codes >= 0) & (ans_codes < _ANSWERED_CODE),
+                "answered_cnt": ans_codes == _ANSWERED_CODE,
+                "not_interested_cnt": (comp_res == RESULT_NOT_INTERESTED).to_numpy(),
+            })
+            .groupby(comp_code, sort=False)
+            .sum()
+            # index-aligned lookup onto the pool keys: only these three int
+            # columns are touched, never the (wide) pool itself
+            .reindex(pool_code, fill_value=0)
+        )
 
         # Unreachable count ≥ N (this month)
         if drop_unreachable_repeat:
-            unreachable_mask = comp_min["ans"].isin(UNREACHABLE_ANS_STATUSES)
-            unreachable_counts = (
-                comp_min[unreachable_mask]
-                .groupby(["username", "phone", "platform"], dropna=False)
-                .size()
-                .rename("unreach_cnt")
-            )
-        else:
-            unreachable_counts = pd.Series(dtype="int64")
+            keep &= stats["unreach_cnt"].to_numpy() < int(unreachable_min_count)
 
         # Answered-before (this month)
         if drop_answered_this_month:
-            answered_keys = set(
-                comp_min.loc[comp_min["ans"] == ANSWERED_STATUS, ["username", "phone", "platform"]]
-                .dropna(how="all")
-                .apply(lambda r: f"{r['phone']}|{r['username']}|{r['platform']}", axis=1)
-                .tolist()
-            )
-        else:
-            answered_keys = set()
+            keep &= stats["answered_cnt"].to_numpy() == 0
 
         # Not interested (this month)
         if drop_not_interested_this_month:
-            not_interested_keys = set(
-                comp_min.loc[comp_min["res"] == RESULT_NOT_INTERESTED, ["username", "phone", "platform"]]
-                .dropna(how="all")
-                .apply(lambda r: f"{r['phone']}|{r['username']}|{r['platform']}", axis=1)
-                .tolist()
-            )
-        else:
-            not_interested_keys = set()
-
-        # Build pool keys to match against Compile-derived sets
-        pool_key = _triple_key(df)
-
-        # Apply unreachable≥N
-        if drop_unreachable_repeat and not unreachable_counts.empty:
-            # join counts onto df by (username, phone, platform)
-            df3 = df.assign(_key=pool_key)
-            # explode unreachable_counts into a df for merge
-            uc_df = unreachable_counts.reset_index().assign(
-                _key=lambda t: t["phone"].astype(str) + "|" + t["username"].astype(str) + "|" + t["platform"].astype(str)
-            )[["_key", "unreach_cnt"]]
-            df3 = df3.merge(uc_df, on="_key", how="left")
-            df3["unreach_cnt"] = df3["unreach_cnt"].fillna(0).astype(int)
-            keep &= df3["unreach_cnt"] < int(unreachable_min_count)
-
-        # Answered this month
-        if drop_answered_this_month and answered_keys:
-            keep &= ~pool_key.isin(answered_keys)
-
-        # Not interested this month
-        if drop_not_interested_this_month and not_interested_keys:
-            keep &= ~pool_key.isin(not_interested_keys)
+            keep &= stats["not_interested_cnt"].to_numpy() == 0
 
     # --- Lifetime rules from past results (ever) -------------------------------
     # These require looking at lifetime outcomes. Since we only have current-month Compile right now,
     # we treat them as "drop if present in pool row already" or skip (until lifetime history available).
-    if drop_invalid_number and "Result" in df.columns:
-        keep &= df["Result"].astype(str) != RESULT_INVALID_NUMBER
-
-    if drop_not_owner_as_blacklist and "Result" in df.columns:
-        keep &= df["Result"].astype(str) != RESULT_NOT_OWNER
+    if "Result" in df.columns:
+        bad_results = [
+            r for r, on in ((RESULT_INVALID_NUMBER, drop_invalid_number),
+                            (RESULT_NOT_OWNER, drop_not_owner_as_blacklist)) if on
+        ]
+        if bad_results:
+            # one pass over Result for both rules
+            keep &= ~as_str_series(df["Result"]).isin(np.asarray(bad_results, dtype=object)).to_numpy()
 
     # --- Redeemed today from Grafana ------------------------------------------
     if drop_redeemed_today and redeemed_set:
         # pool may use 'username' col
-        keep &= ~df["username"].astype(str).isin(redeemed_set)
+        keep &= ~as_str_series(df["username"]).isin(np.asarray(list(redeemed_set), dtype=object)).to_numpy()
 
     # Done
-    return df[keep].reset_index(drop=True)
+    return df.iloc[keep].reset_index(drop=True)
@@ -0,0 +1,126 @@
+# telesales/io_cache.py
+"""
+Small on-disk cache for Config-sheet tabs (Callers, Config, ...) and the
+output-folder listing used to find the monthly files.
+
+- These change rarely, but every read is a Sheets/Drive API round-trip.
+- Tab entries live under ~/.cache/telesales/<hash>.pkl, keyed by (sheet_id, tab_name);
+  the folder listing under ~/.cache/telesales/drive_folder_<folder_id>.json.
+- An entry is fresh while its file mtime is younger than ttl_seconds.
+- ttl_seconds <= 0, dry-run clients, and empty results bypass the cache
+  (so a failed/empty read is never pinned for the next run).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+CACHE_DIR = Path.home() / ".cache" / "telesales"
+
+
+def _cache_path(sheet_id: str, tab_name: str) -> Path:
+    digest = hashlib.sha1(f"{sheet_id}|{tab_name}".encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{digest}.pkl"
+
+
+def _load_fresh(path: Path, ttl_seconds: int):
+    """Return the cached DataFrame at path if younger than ttl_seconds, else None."""
+    try:
+        if time.time() - path.stat().st_mtime < ttl_seconds:
+            return pd.read_pickle(path)
+    except Exception:
+        pass  # missing/corrupt entry -> live read
+    return None
+
+
+def _store(path: Path, tab_name: str, df: pd.DataFrame) -> None:
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[cache] could not write {tab_name} cache: {e}")
+
+
+def read_tab_cached(sc, sheet_id: str | None, tab_name: str, ttl_seconds: int = 900) -> pd.DataFrame:
+    """
+    Same contract as SheetsClient.read_tab_as_df, but served from disk when fresh.
+    Cache problems (unreadable/unwritable files) fall back to a live read.
+    """
+    if not sheet_id or ttl_seconds <= 0 or getattr(sc, "dry_run", False):
+        return sc.read_tab_as_df(sheet_id, tab_name)
+
+    path = _cache_path(sheet_id, tab_name)
+    df = _load_fresh(path, ttl_seconds)
+    if df is None:
+        df = sc.read_tab_as_df(sheet_id, tab_name)
+        _store(path, tab_name, df)
+    return df
+
+
+def read_tabs_cached(sc, sheet_id: str | None, tabs: List[str], ttl_seconds: int = 900) -> Dict[str, pd.DataFrame]:
+    """
+    Multi-tab variant: fresh tabs come from disk, the rest are fetched together
+    with one SheetsClient.read_tabs_batch round-trip.
+    """
+    if not sheet_id:
+        return {t: pd.DataFrame() for t in tabs}
+    if ttl_seconds <= 0 or getattr(sc, "dry_run", False):
+        return sc.read_tabs_batch(sheet_id, tabs)
+
+    out: Dict[str, pd.DataFrame] = {}
+    misses: List[str] = []
+    for t in tabs:
+        df = _load_fresh(_cache_path(sheet_id, t), ttl_seconds)
+        if df is None:
+            misses.append(t)
+        else:
+            out[t] = df
+    if misses:
+        for t, df in sc.read_tabs_batch(sheet_id, misses).items():
+            _store(_cache_path(sheet_id, t), t, df)
+            out[t] = df
+    return {t: out.get(t, pd.DataFrame()) for t in tabs}
+
+
+def _folder_index_path(folder_id: str) -> Path:
+    return CACHE_DIR / f"drive_folder_{folder_id}.json"
+
+
+def load_folder_index(folder_id: str, ttl_seconds: int) -> Optional[Dict[str, Tuple[str, str]]]:
+    """Cached {name: (file_id, webViewLink)} for the Drive folder if younger than ttl_seconds, else None."""
+    if not folder_id or ttl_seconds <= 0:
+        return None
+    path = _folder_index_path(folder_id)
+    try:
+        if time.time() - path.stat().st_mtime < ttl_seconds:
+            with open(path, encoding="utf-8") as fh:
+                return {name: (fid, url) for name, (fid, url) in json.load(fh).items()}
+    except Exception:
+        pass  # missing/corrupt entry -> live listing
+    return None
+
+
+def store_folder_index(folder_id: str, index: Dict[str, Tuple[str, str]]) -> None:
+    """Write the folder index atomically (tmp file + os.replace); empty indexes are not stored."""
+    if not folder_id or not index:
+        return
+    path = _folder_index_path(folder_id)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({name: list(v) for name, v in index.items()}, fh, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[cache] could not write Drive folder index: {e}")
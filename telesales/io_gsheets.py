@@ -11,33 +11,28 @@ Google Sheets / Drive helpers with a *forgiving* dry‑run mode.
     * upsert to Compile (remove today's rows, append fresh)
 
 Requirements (in requirements.txt):
-  - gspread, gspread-dataframe
+  - gspread
   - google-api-python-client, google-auth
   - pandas
 """
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, Optional, Tuple
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-# Third‑party Google libs (optional at import time)
-try:
-    import gspread
-    from gspread_dataframe import set_with_dataframe, get_as_dataframe
-    from google.oauth2.service_account import Credentials
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
-except Exception:
-    gspread = None
-    set_with_dataframe = None
-    get_as_dataframe = None
-    Credentials = None
-    build = None
-    HttpError = Exception  # type: ignore
+from .io_cache import load_folder_index, store_folder_index
+from .utils import as_str_series
+
+# Third‑party Google libs are imported lazily in SheetsClient.__init__, only when
+# a service account is configured: dry-run/CI runs never pay their import cost.
 
 
 # ----------------------------- datamodel --------------------------------------
@@ -49,6 +44,184 @@ class SheetsInfo:
     title: str
 
 
+# ----------------------------- helpers ----------------------------------------
+
+# Process-wide tab cache shared by every SheetsClient instance (the pipelines
+# build a fresh client per tier). Keyed by (spreadsheet_id, tab_name); each entry
+# carries the Drive modifiedTime looked up just before its live read, and is only
+# served while the file's modifiedTime still matches.
+# Guarded by a lock: the pipeline reads/writes both tiers from worker threads.
+_TAB_CACHE: "OrderedDict[Tuple[str, str], Tuple[Optional[str], pd.DataFrame]]" = OrderedDict()
+_TAB_CACHE_MAX = 64
+_TAB_CACHE_LOCK = threading.Lock()
+
+
+def _tab_cache_get(key: Tuple[str, str], modified: str) -> Optional[pd.DataFrame]:
+    with _TAB_CACHE_LOCK:
+        entry = _TAB_CACHE.get(key)
+        if entry is None or entry[0] != modified:
+            return None
+        _TAB_CACHE.move_to_end(key)
+        return entry[1].copy()  # callers never share (or mutate) the cached frame
+
+
+def _tab_cache_put(key: Tuple[str, str], modified: str, df: pd.DataFrame) -> None:
+    with _TAB_CACHE_LOCK:
+        _TAB_CACHE[key] = (modified, df.copy())
+        _TAB_CACHE.move_to_end(key)
+        while len(_TAB_CACHE) > _TAB_CACHE_MAX:
+            _TAB_CACHE.popitem(last=False)
+
+
+def _tab_cache_evict(spreadsheet_id: str, tab_name: str) -> None:
+    with _TAB_CACHE_LOCK:
+        _TAB_CACHE.pop((spreadsheet_id, tab_name), None)
+
+
+def _frame_digest(df: pd.DataFrame) -> str:
+    """Content hash of a frame (header + cell values, index ignored)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _values_to_df(values: List[List[str]]) -> pd.DataFrame:
+    """
+    Parse a raw Sheets values block (first row = header) into a DataFrame,
+    the same way gspread-dataframe does, with read_tab_as_df's "empty" rules.
+    """
+    if not values or all(v == "" for v in values[0]):
+        return pd.DataFrame()
+    width = max(len(r) for r in values)
+    rows = [list(r) + [""] * (width - len(r)) for r in values]
+
+    # Header names as pandas' CSV reader would give them: blanks become
+    # "Unnamed: i", repeats get ".1", ".2" suffixes.
+    header: List[str] = []
+    seen: Dict[str, int] = {}
+    for i, name in enumerate(rows[0]):
+        base = name = str(name) if name != "" else f"Unnamed: {i}"
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen.setdefault(base, 0)
+        seen[name] = 0
+        header.append(name)
+
+    # A blank header row leaves only Unnamed columns — treat as empty
+    if all(c.startswith("Unnamed:") for c in header):
+        return pd.DataFrame()
+
+    df = pd.DataFrame(rows[1:], columns=header, dtype=object).replace("", np.nan)
+    for c in df.columns:
+        col = df[c].dropna()
+        if col.empty:
+            continue
+        if col.str.lower().isin(["true", "false"]).all():
+            df[c] = df[c].str.lower().map({"true": True, "false": False})
+            continue
+        try:
+            df[c] = pd.to_numeric(df[c])
+        except (ValueError, TypeError):
+            pass
+    df = df.infer_objects()
+
+    # Drop trailing all‑NaN rows that sometimes appear
+    return df.dropna(how="all")
+
+
+def _df_to_values(df: pd.DataFrame) -> List[list]:
+    """
+    Header + rows for a USER_ENTERED values.update, with set_with_dataframe's cell
+    rules: NaN -> "", numbers/bools as-is, everything else str, "'x" escaped to "''x".
+    Built column-wise instead of one Cell object per value.
+    """
+    cols = []
+    for name in df.columns:
+        s = df[name]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype(object)  # "" isn't a category; cast once, then the usual rules
+        if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            v = s.astype(object).where(s.notna(), "")
+        else:
+            v = as_str_series(s.where(s.notna(), ""))
+            v = v.mask(v.str.startswith("'"), "'" + v)
+        cols.append(v.to_numpy(dtype=object))
+    rows = np.column_stack(cols).tolist() if cols else [[] for _ in range(len(df))]
+    return [[str(c) for c in df.columns]] + rows
+
+
+def _values_to_tsv(values: List[list]) -> Optional[str]:
+    """
+    Tab-separated text of _df_to_values output for a pasteData request (parsed like
+    typed input, same as USER_ENTERED). None when some cell holds a tab or line
+    break, or starts with a double quote (pasteData reads that as a quoted field and
+    may strip quotes / merge cells) -> caller falls back to values.update.
+    """
+    lines = []
+    for row in values:
+        line = "\t".join(map(str, row))
+        if line.count("\t") != max(len(row) - 1, 0) or "\n" in line or "\r" in line:
+            return None
+        # a cell starts with '"' iff the line does or a tab is followed by one
+        if line.startswith('"') or '\t"' in line:
+            return None
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _pooled_session(creds):
+    """
+    AuthorizedSession for gspread with a larger keep-alive pool and transport-level
+    retries (429/5xx with backoff), so the many small Sheets calls of a run reuse
+    TLS connections. Drive's discovery client already reuses its own httplib2 Http.
+    """
+    from google.auth.transport.requests import AuthorizedSession
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    sess = AuthorizedSession(creds)
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,  # hand the last response to gspread so it raises APIError as usual
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+
+def _parse_day(s: pd.Series) -> np.ndarray:
+    """DD-MM-YYYY strings (today_key format) -> datetime64; anything else -> NaT."""
+    return pd.to_datetime(as_str_series(s).str.strip(), format="%d-%m-%Y", errors="coerce").to_numpy()
+
+
+def _same_day_mask(dates: pd.Series, today_dates: pd.Series) -> np.ndarray:
+    """
+    True where `dates` falls on one of the days in `today_dates`.
+    Compared as datetime64 (int64) values, so "3-1-2025" matches "03-01-2025";
+    cells that don't parse as DD-MM-YYYY fall back to exact string equality.
+    Only the distinct dates are parsed (a month of Compile has ~30), then
+    broadcast back through the factorize codes.
+    """
+    today_str = as_str_series(today_dates).unique()
+    today_days = _parse_day(pd.Series(today_str))
+    today_days = today_days[~np.isnat(today_days)]
+    codes, uniq = pd.factorize(as_str_series(dates), use_na_sentinel=False)
+    uniq = pd.Series(uniq)
+    parsed = _parse_day(uniq)
+    ok = ~np.isnat(parsed)
+    # usually a single Assign Date -> one scalar comparison
+    same = parsed == today_days[0] if len(today_days) == 1 else np.isin(parsed, today_days)
+    hit = ok & same
+    if not ok.all():
+        hit |= ~ok & uniq.isin(today_str).to_numpy()
+    return hit[codes]
+
+
 # ----------------------------- client -----------------------------------------
 
 class SheetsClient:
@@ -58,13 +231,38 @@ class SheetsClient:
         service_account_file: Optional[str],
         output_folder_id: Optional[str],
         output_prefix: str = "CBTH",
+        folder_cache_ttl: int = 86400,
     ) -> None:
         self.output_folder_id = output_folder_id
         self.output_prefix = output_prefix
+        # seconds the on-disk output-folder listing stays fresh; 0 always lists live
+        self.folder_cache_ttl = folder_cache_ttl
 
         self._dry_run_reason: Optional[str] = None
         self.gc = None
         self.drive = None
+        self._HttpError: type = Exception
+        # Spreadsheet handles per id: open_by_key is a metadata round-trip, and one
+        # run touches the same month file from several helpers.
+        self._sh_cache: Dict[str, Any] = {}
+        # {spreadsheet_id: {title: sheetId}} in tab order, and {(spreadsheet_id, title): (rows, cols)}.
+        # Listed once per spreadsheet, then kept current from our own batchUpdates (plain
+        # client-side state; gspread Worksheet objects are never patched or built by hand).
+        self._ws_cache: Dict[str, Dict[str, int]] = {}
+        self._grid_sizes: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        # Output-folder spreadsheets by name, filled on first lookup (disk cache or one Drive listing).
+        self._name_index: Optional[Dict[str, Tuple[str, str]]] = None
+        self._index_from_disk = False
+        # Names whose disk-index entry was confirmed live (not trashed) this run.
+        self._checked_names: set = set()
+        # The Drive service (httplib2) is not thread-safe, and find-or-create must not
+        # race itself; every Drive call goes through this lock. Sheets calls share the
+        # pooled requests session and may run concurrently.
+        self._drive_lock = threading.RLock()
+        # One client is shared by the pipeline's worker threads: the spreadsheet-handle,
+        # tab and grid caches above are only read/filled under this lock (a miss opens or
+        # lists a spreadsheet once, and map updates from two workers can't interleave).
+        self._sheets_lock = threading.RLock()
 
         # Decide if we can do real work
         if not service_account_file:
@@ -72,10 +270,16 @@ class SheetsClient:
             self._log_dry_run("no service account")
             return
 
-        if gspread is None or Credentials is None or build is None:
+        try:
+            import gspread
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
+            from googleapiclient.errors import HttpError
+        except Exception:
             self._dry_run_reason = "google libraries not available"
             self._log_dry_run("google libs missing")
             return
+        self._HttpError = HttpError
 
         try:
             scopes = [
@@ -83,7 +287,7 @@ class SheetsClient:
                 "https://www.googleapis.com/auth/drive",
             ]
             creds = Credentials.from_service_account_file(service_account_file, scopes=scopes)
-            self.gc = gspread.authorize(creds)
+            self.gc = gspread.authorize(creds, session=_pooled_session(creds))
             self.drive = build("drive", "v3", credentials=creds, cache_discovery=False)
         except Exception as e:
             self._dry_run_reason = f"auth error: {e}"
@@ -107,6 +311,82 @@ class SheetsClient:
     def _log_dry_run(self, msg: str) -> None:
         print(f"[sheets:DRY‑RUN] {msg}")
 
+    def _sh(self, spreadsheet_id: str):
+        """Open (once) and return the gspread Spreadsheet for spreadsheet_id."""
+        with self._sheets_lock:
+            sh = self._sh_cache.get(spreadsheet_id)
+            if sh is None:
+                sh = self.gc.open_by_key(spreadsheet_id)  # type: ignore
+                self._sh_cache[spreadsheet_id] = sh
+            return sh
+
+    def _tab_map(self, spreadsheet_id: str) -> Dict[str, int]:
+        """The cached {title: sheetId} map itself (listed on first use); call with _sheets_lock held."""
+        by_title = self._ws_cache.get(spreadsheet_id)
+        if by_title is None:
+            by_title = {}
+            for ws in self._sh(spreadsheet_id).worksheets():
+                by_title[ws.title] = ws.id
+                self._grid_sizes[(spreadsheet_id, ws.title)] = (ws.row_count, ws.col_count)
+            self._ws_cache[spreadsheet_id] = by_title
+        return by_title
+
+    def _worksheets(self, spreadsheet_id: str) -> Dict[str, int]:
+        """Snapshot of {title: sheetId} for the spreadsheet in tab order, listed once and then kept in sync locally."""
+        with self._sheets_lock:
+            return dict(self._tab_map(spreadsheet_id))
+
+    def _grid_size(self, spreadsheet_id: str, title: str) -> Optional[Tuple[int, int]]:
+        with self._sheets_lock:
+            return self._grid_sizes.get((spreadsheet_id, title))
+
+    def _add_worksheet(self, spreadsheet_id: str, title: str, rows, cols):
+        ws = self._sh(spreadsheet_id).add_worksheet(title=title, rows=rows, cols=cols)
+        with self._sheets_lock:
+            self._tab_map(spreadsheet_id)[title] = ws.id
+            self._grid_sizes[(spreadsheet_id, title)] = (ws.row_count, ws.col_count)
+        return ws
+
+    def _mirror_requests(self, spreadsheet_id: str, requests: List[dict]) -> None:
+        """
+        Apply the structural part of a batchUpdate we just sent (addSheet, deleteSheet,
+        grid resize, move to index 0) to the local tab/grid maps; data requests are ignored.
+        """
+        with self._sheets_lock:
+            self._mirror_locked(spreadsheet_id, requests)
+
+    def _mirror_locked(self, spreadsheet_id: str, requests: List[dict]) -> None:
+        by_title = self._tab_map(spreadsheet_id)
+        for r in requests:
+            if "addSheet" in r:
+                props = r["addSheet"]["properties"]
+                grid = props["gridProperties"]
+                by_title[props["title"]] = props["sheetId"]
+                self._grid_sizes[(spreadsheet_id, props["title"])] = (grid["rowCount"], grid["columnCount"])
+                continue
+            if "deleteSheet" in r:
+                sheet_id = r["deleteSheet"]["sheetId"]
+                title = next((t for t, i in by_title.items() if i == sheet_id), None)
+                if title is not None:
+                    del by_title[title]
+                    self._grid_sizes.pop((spreadsheet_id, title), None)
+                    print(f"[sheets] Deleted empty {title} in {spreadsheet_id}")
+                continue
+            if "updateSheetProperties" not in r:
+                continue
+            props = r["updateSheetProperties"]["properties"]
+            title = next((t for t, i in by_title.items() if i == props["sheetId"]), None)
+            if title is None:
+                continue
+            if "gridProperties" in props:
+                grid = props["gridProperties"]
+                self._grid_sizes[(spreadsheet_id, title)] = (grid["rowCount"], grid["columnCount"])
+            if props.get("index") == 0:
+                moved = {title: by_title.pop(title)}
+                moved.update(by_title)
+                by_title.clear()
+                by_title.update(moved)
+
     # -------------------------- naming helpers --------------------------------
 
     def month_title(self, tier_label: str, dt: Optional[datetime] = None) -> str:
@@ -115,12 +395,77 @@ class SheetsClient:
 
     # -------------------------- Drive helpers ---------------------------------
 
+    def _drive_prefetch_folder(self) -> Optional[Dict[str, Tuple[str, str]]]:
+        """
+        List every spreadsheet in the output folder once (paginated) and index it by name:
+        {name: (file_id, webViewLink)}. Returns None if the listing fails.
+        """
+        q = (
+            f"'{self.output_folder_id}' in parents and "
+            f"mimeType = 'application/vnd.google-apps.spreadsheet' and "
+            f"trashed = false"
+        )
+        index: Dict[str, Tuple[str, str]] = {}
+        page_token = None
+        try:
+            while True:
+                resp = self.drive.files().list(
+                    q=q,
+                    fields="nextPageToken, files(id, name, webViewLink)",
+                    pageSize=1000,
+                    pageToken=page_token,
+                ).execute()
+                for f in resp.get("files", []):
+                    index.setdefault(
+                        f["name"],
+                        (f["id"], f.get("webViewLink", f"https://docs.google.com/spreadsheets/d/{f['id']}")),
+                    )
+                page_token = resp.get("nextPageToken")
+                if not page_token:
+                    return index
+        except self._HttpError as e:
+            self._log(f"Drive folder listing error: {e}")
+            return None
+
+    def _load_folder_index(self) -> Optional[Dict[str, Tuple[str, str]]]:
+        """
+        Folder index from the on-disk cache when it is younger than folder_cache_ttl
+        (warm cron/CI starts skip Drive), else a live listing that refreshes the cache.
+        """
+        index = load_folder_index(self.output_folder_id, self.folder_cache_ttl)
+        self._index_from_disk = index is not None
+        if index is not None:
+            self._log(f"Output folder index from disk cache ({len(index)} files)")
+            return index
+        index = self._drive_prefetch_folder()
+        if index is not None and self.folder_cache_ttl > 0:
+            store_folder_index(self.output_folder_id, index)
+        return index
+
     def _drive_search_by_name(self, name: str) -> Optional[Tuple[str, str]]:
         """
         Return (file_id, webViewLink) for a spreadsheet with exact name in output folder.
+        The folder is listed once per client (or read from the disk cache); later lookups
+        are dict hits. A miss against the disk cache re-lists the folder once, and so
+        does a disk hit whose file has since been trashed or removed.
         """
         if self.drive is None or not self.output_folder_id:
             return None
+        if self._name_index is None:
+            self._name_index = self._load_folder_index()
+        if self._name_index is not None and self._index_from_disk and not self._disk_hit_live(name):
+            # Cached listing may predate the file (new month, made elsewhere) or point at a
+            # trashed/replaced one: list live once before the caller creates a duplicate.
+            self._index_from_disk = False
+            fresh = self._drive_prefetch_folder()
+            if fresh is not None:
+                self._name_index = fresh
+                if self.folder_cache_ttl > 0:
+                    store_folder_index(self.output_folder_id, fresh)
+        if self._name_index is not None:
+            return self._name_index.get(name)
+
+        # Listing failed -> single-name query as before
         try:
             safe_name = name.replace("'", "\\'")
             q = (
@@ -137,10 +482,28 @@ class SheetsClient:
                 f = files[0]
                 return f["id"], f.get("webViewLink", f"https://docs.google.com/spreadsheets/d/{f['id']}")
             return None
-        except HttpError as e:
+        except self._HttpError as e:
             self._log(f"Drive search error: {e}")
             return None
 
+    def _disk_hit_live(self, name: str) -> bool:
+        """Whether the disk-cached index has `name` and its file is still live (checked once per name)."""
+        hit = self._name_index.get(name) if self._name_index is not None else None
+        if hit is None:
+            return False
+        if name in self._checked_names:
+            return True
+        try:
+            meta = self.drive.files().get(fileId=hit[0], fields="trashed").execute()
+        except self._HttpError as e:
+            self._log(f"Cached file for {name} not found ({e}); re-listing folder")
+            return False
+        if meta.get("trashed"):
+            self._log(f"Cached file for {name} is trashed; re-listing folder")
+            return False
+        self._checked_names.add(name)
+        return True
+
     def _drive_create_spreadsheet(self, name: str) -> Optional[Tuple[str, str]]:
         if self.drive is None or self.gc is None or not self.output_folder_id:
             return None
@@ -157,8 +520,12 @@ class SheetsClient:
             file_id = file["id"]
             url = file.get("webViewLink", f"https://docs.google.com/spreadsheets/d/{file_id}")
             self._log(f"Created spreadsheet: {name} ({file_id})")
+            if self._name_index is not None:
+                self._name_index[name] = (file_id, url)
+                if self.folder_cache_ttl > 0:
+                    store_folder_index(self.output_folder_id, self._name_index)
             return file_id, url
-        except HttpError as e:
+        except self._HttpError as e:
             self._log(f"Drive create error: {e}")
             return None
 
@@ -175,14 +542,15 @@ class SheetsClient:
             self._log_dry_run(f"find_or_create_month_file('{title}')")
             return SheetsInfo("DRY-RUN", "https://example.com", title)
 
-        # Try find
-        found = self._drive_search_by_name(title)
-        if found:
-            file_id, url = found
-            return SheetsInfo(file_id, url, title)
+        with self._drive_lock:
+            # Try find
+            found = self._drive_search_by_name(title)
+            if found:
+                file_id, url = found
+                return SheetsInfo(file_id, url, title)
 
-        # Create
-        created = self._drive_create_spreadsheet(title)
+            # Create
+            created = self._drive_create_spreadsheet(title)
         if created:
             file_id, url = created
             return SheetsInfo(file_id, url, title)
@@ -192,30 +560,63 @@ class SheetsClient:
         return SheetsInfo("UNKNOWN", "https://docs.google.com", title)
 
     def ensure_tabs(self, spreadsheet_id: str, required_tabs: list[str]):
-        sh = self.gc.open_by_key(spreadsheet_id)  # open spreadsheet
-        existing = {ws.title for ws in sh.worksheets()}
-
-        # Create missing tabs
-        for tab in required_tabs:
-            if tab not in existing:
-                sh.add_worksheet(title=tab, rows="1000", cols="26")
-
-        # Re-order so "Compile" stays first if it exists
-        if "Compile" in required_tabs and "Compile" in existing:
-            try:
-                ws = sh.worksheet("Compile")
-                sh.reorder_worksheets([ws] + [w for w in sh.worksheets() if w != ws])
-            except Exception as e:
-                print(f"[sheets] reorder failed: {e}")
-
-        # Delete empty default tab "Sheet1" if still present
-        if "Sheet1" in existing and len(sh.worksheets()) > len(required_tabs):
-            try:
-                ws = sh.worksheet("Sheet1")
-                sh.del_worksheet(ws)
-                print(f"[sheets] Deleted empty Sheet1 in {spreadsheet_id}")
-            except Exception:
-                pass
+        if self.dry_run or spreadsheet_id in {"DRY-RUN", "UNKNOWN"}:
+            self._log_dry_run(f"ensure_tabs({required_tabs})")
+            return
+
+        sh = self._sh(spreadsheet_id)
+        by_title = self._worksheets(spreadsheet_id)
+        requests, new_ids = self._layout_requests(by_title, required_tabs)
+        if not requests:
+            return
+
+        try:
+            sh.batch_update({"requests": requests})
+        except Exception as e:
+            print(f"[sheets] ensure_tabs batch failed ({e}); adding tabs one by one")
+            for t in new_ids:
+                self._add_worksheet(spreadsheet_id, t, rows="1000", cols="26")
+            return
+        self._mirror_requests(spreadsheet_id, requests)
+
+    def _layout_requests(
+        self,
+        by_title: Dict[str, int],
+        required_tabs: List[str],
+        grids: Optional[Dict[str, dict]] = None,
+        arrange: bool = True,
+    ) -> Tuple[List[dict], Dict[str, int]]:
+        """
+        Structural batchUpdate requests: add missing tabs (with explicit sheetIds, so
+        later requests in the same batch can target them) and, if arrange, move
+        "Compile" first and delete the default "Sheet1".
+        Returns (requests, {new_tab: sheetId}).
+        """
+        grids = grids or {}
+        existing = set(by_title)
+        missing = [t for t in dict.fromkeys(required_tabs) if t not in existing]
+        first_id = max(by_title.values(), default=0) + 1
+        new_ids = {t: first_id + i for i, t in enumerate(missing)}
+        requests: List[dict] = [
+            {"addSheet": {"properties": {
+                "sheetId": new_ids[t], "title": t,
+                "gridProperties": grids.get(t, {"rowCount": 1000, "columnCount": 26}),
+            }}}
+            for t in missing
+        ]
+        if not arrange:
+            return requests, new_ids
+        # Compile already first (every run after the first) -> no move request
+        if "Compile" in required_tabs and "Compile" in existing and next(iter(by_title)) != "Compile":
+            requests.append({"updateSheetProperties": {
+                "properties": {"sheetId": by_title["Compile"], "index": 0}, "fields": "index",
+            }})
+        if (
+            "Sheet1" in existing and "Sheet1" not in required_tabs
+            and len(existing) + len(missing) > len(required_tabs)
+        ):
+            requests.append({"deleteSheet": {"sheetId": by_title["Sheet1"]}})
+        return requests, new_ids
 
 
     def write_df_to_tab(self, spreadsheet_id: str, tab_name: str, df: pd.DataFrame) -> None:
@@ -228,91 +629,289 @@ class SheetsClient:
             self._log_dry_run(f"write_df_to_tab({tab_name}) rows={len(df)}")
             return
 
-        if set_with_dataframe is None:
-            self._log("gspread-dataframe not available; cannot write. (Did you install requirements?)")
+        self.write_tabs(spreadsheet_id, {tab_name: df})
+
+    def write_tabs(
+        self,
+        spreadsheet_id: str,
+        frames: Dict[str, pd.DataFrame],
+        layout: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Replace several tabs (headers included), usually in ONE round-trip:
+        a batchUpdate that adds missing tabs, sizes every grid to exactly
+        header+rows x cols and pastes each tab's data as tab-separated text
+        (pasteData, far smaller than per-cell JSON). Tabs whose cells hold tabs/line
+        breaks go out in one follow-up values.batchUpdate. "" clears a cell and
+        shrinking the grid drops trailing rows, so no separate clear is needed.
+        layout: also do ensure_tabs(layout)'s work (add those tabs, Compile first,
+        drop Sheet1) in the same batchUpdate.
+        """
+        frames = {t: df for t, df in frames.items() if df is not None}
+        if not frames:
+            return
+        if self.dry_run or spreadsheet_id in {"DRY-RUN", "UNKNOWN"}:
+            for t, df in frames.items():
+                self._log_dry_run(f"write_df_to_tab({t}) rows={len(df)}")
             return
 
-        sh = self.gc.open_by_key(spreadsheet_id)  # type: ignore
+        sh = self._sh(spreadsheet_id)
+        by_title = self._worksheets(spreadsheet_id)
+        values = {t: _df_to_values(df) for t, df in frames.items()}
+
+        def grid(t: str) -> dict:
+            return {"rowCount": len(values[t]), "columnCount": max(len(frames[t].columns), 1)}
+
+        requests, new_ids = self._layout_requests(
+            by_title, list(dict.fromkeys([*(layout or []), *frames])),
+            grids={t: grid(t) for t in frames}, arrange=layout is not None,
+        )
+        # grids already at the target size (e.g. a rerun with the same row count) need no resize
+        resize = [
+            t for t in frames
+            if t in by_title and self._grid_size(spreadsheet_id, t) != tuple(grid(t).values())
+        ]
+        requests += [
+            {"updateSheetProperties": {
+                "properties": {"sheetId": by_title[t], "gridProperties": grid(t)},
+                "fields": "gridProperties(rowCount,columnCount)",
+            }}
+            for t in resize
+        ]
+        # data rides in the same batchUpdate (after the adds/resizes); new tabs by their preset id
+        json_tabs: List[str] = []
+        for t in frames:
+            tsv = _values_to_tsv(values[t])
+            if tsv is None:
+                json_tabs.append(t)
+                continue
+            requests.append({"pasteData": {
+                "coordinate": {"sheetId": new_ids.get(t) or by_title[t], "rowIndex": 0, "columnIndex": 0},
+                "data": tsv,
+                "type": "PASTE_NORMAL",
+                "delimiter": "\t",
+            }})
+        if requests:
+            sh.batch_update({"requests": requests})
+            self._mirror_requests(spreadsheet_id, requests)
+
+        if json_tabs:
+            sh.values_batch_update({
+                "valueInputOption": "USER_ENTERED",
+                "data": [
+                    {"range": "'{}'!A1".format(t.replace("'", "''")), "values": values[t]}
+                    for t in json_tabs
+                ],
+            })
+        for t in frames:
+            _tab_cache_evict(spreadsheet_id, t)
+
+    def _modified_time(self, spreadsheet_id: str) -> Optional[str]:
+        """Drive modifiedTime of the file (cheap metadata call); None if unavailable."""
+        if self.drive is None:
+            return None
         try:
-            ws = sh.worksheet(tab_name)
-        except Exception:
-            ws = sh.add_worksheet(title=tab_name, rows=1, cols=1)
-
-        ws.clear()
-        set_with_dataframe(ws, df, include_index=False, include_column_header=True, resize=True)
+            with self._drive_lock:
+                meta = self.drive.files().get(fileId=spreadsheet_id, fields="modifiedTime").execute()
+            return meta.get("modifiedTime")
+        except Exception as e:
+            self._log(f"modifiedTime lookup failed ({e}); reading without cache")
+            return None
 
     def read_tab_as_df(self, spreadsheet_id: str, tab_name: str) -> pd.DataFrame:
         """
         Return the tab as a DataFrame.
         If the tab exists but is empty (no header/rows), return an empty DataFrame.
+        Unchanged files (same Drive modifiedTime) are served from the process-wide cache.
         """
         if self.dry_run or spreadsheet_id in {"DRY-RUN", "UNKNOWN"}:
             self._log_dry_run(f"read_tab_as_df({tab_name}) -> empty df")
             return pd.DataFrame()
 
-        if get_as_dataframe is None:
-            self._log("gspread-dataframe not available; cannot read. Returning empty df.")
-            return pd.DataFrame()
+        # modifiedTime is taken before the live read, so an edit landing mid-read
+        # leaves a stale stamp (a re-read next time) rather than a stale hit.
+        key = (spreadsheet_id, tab_name)
+        modified = self._modified_time(spreadsheet_id)
+        if modified:
+            cached = _tab_cache_get(key, modified)
+            if cached is not None:
+                return cached
+
+        df = self._read_tab_live(spreadsheet_id, tab_name)
+        if modified and not df.empty:
+            _tab_cache_put(key, modified, df)
+        else:
+            _tab_cache_evict(spreadsheet_id, tab_name)
+        return df
 
+    def _read_tab_live(self, spreadsheet_id: str, tab_name: str) -> pd.DataFrame:
         try:
-            sh = self.gc.open_by_key(spreadsheet_id)  # type: ignore
-            try:
-                ws = sh.worksheet(tab_name)
-            except Exception:
-                return pd.DataFrame()
-
-            # Detect truly empty sheets (no values at all)
-            values = ws.get_all_values()
-            if not values or (len(values) == 1 and all(v == "" for v in values[0])):
-                return pd.DataFrame()
-
-            # Parse with first row as header
-            df = get_as_dataframe(ws, evaluate_formulas=True, header=0)
-            if df is None:
+            sh = self._sh(spreadsheet_id)
+            if tab_name not in self._worksheets(spreadsheet_id):
                 return pd.DataFrame()
-
-            # If header row was blank, pandas may create Unnamed columns — treat as empty
-            col_names = [str(c) for c in df.columns]
-            if not col_names or all(c.startswith("Unnamed:") for c in col_names):
-                return pd.DataFrame()
-
-            # Drop trailing all‑NaN rows that sometimes appear
-            return df.dropna(how="all")
+            # One values.get for the whole tab (no second download for parsing);
+            # parsed like gspread-dataframe by _values_to_df.
+            resp = sh.values_get("'{}'".format(tab_name.replace("'", "''")))
+            return _values_to_df(resp.get("values", []))
 
         except Exception as e:
             self._log(f"read_tab_as_df error on '{tab_name}': {e}")
             return pd.DataFrame()
 
-    def upsert_compile(self, spreadsheet_id: str, today_df: pd.DataFrame, assign_date_col: str = "Assign Date") -> None:
+    def read_tabs_batch(self, spreadsheet_id: str, tabs: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Read several tabs of one spreadsheet in a single values.batchGet round-trip.
+        Returns {tab_name: DataFrame}; missing/empty tabs map to an empty DataFrame.
+        Falls back to per-tab read_tab_as_df if the batch call fails.
+        """
+        tabs = list(dict.fromkeys(tabs))
+        if self.dry_run or spreadsheet_id in {"DRY-RUN", "UNKNOWN"}:
+            self._log_dry_run(f"read_tabs_batch({tabs}) -> empty dfs")
+            return {t: pd.DataFrame() for t in tabs}
+        if not tabs:
+            return {}
+
+        try:
+            sh = self._sh(spreadsheet_id)
+            existing = set(self._worksheets(spreadsheet_id))
+            present = [t for t in tabs if t in existing]
+            out: Dict[str, pd.DataFrame] = {t: pd.DataFrame() for t in tabs}
+            if present:
+                ranges = ["'{}'".format(t.replace("'", "''")) for t in present]
+                resp = sh.values_batch_get(ranges)
+                for tab, vr in zip(present, resp.get("valueRanges", [])):
+                    out[tab] = _values_to_df(vr.get("values", []))
+            return out
+        except Exception as e:
+            self._log(f"read_tabs_batch error ({e}); falling back to per-tab reads")
+            return {t: self.read_tab_as_df(spreadsheet_id, t) for t in tabs}
+
+    def upsert_compile(
+        self,
+        spreadsheet_id: str,
+        today_df: pd.DataFrame,
+        assign_date_col: str = "Assign Date",
+        day_tab: Optional[str] = None,
+    ) -> None:
         """
         Upsert today's rows into Compile:
           - read Compile
-          - drop rows where Assign Date == today (string match)
+          - drop rows where Assign Date == today (date match, string fallback)
           - append today's rows
           - write back
+        If day_tab is given, today_df is also written to that tab in the same
+        batched write as Compile (instead of a separate write_df_to_tab).
+        A rerun with identical rows is skipped: "<day_tab>:<content hash>" of the last
+        upsert is kept in one Drive appProperties key (overwritten on every write) and
+        only trusted while Compile and the day tab still have the grid we wrote.
         """
         if today_df is None:
             return
         if self.dry_run or spreadsheet_id in {"DRY-RUN", "UNKNOWN"}:
+            if day_tab:
+                self._log_dry_run(f"write_df_to_tab({day_tab}) rows={len(today_df)}")
             self._log_dry_run(f"upsert_compile(rows={len(today_df)})")
             return
 
+        stamp = f"{day_tab or ''}:{_frame_digest(today_df)}"
+        if self._app_property(spreadsheet_id, "upsert_hash") == stamp and self._upsert_intact(
+            spreadsheet_id, today_df, day_tab
+        ):
+            self._log(f"upsert_compile: rows unchanged since last run ({len(today_df)}); skipping write")
+            return
+
+        append_only, compile_out = self._plan_compile(spreadsheet_id, today_df, assign_date_col, day_key=day_tab)
+        frames = {day_tab: today_df} if day_tab else {}
+        if not append_only:
+            frames["Compile"] = compile_out
+        # creates the day tab / keeps Compile first in the same batch (no separate ensure_tabs)
+        self.write_tabs(spreadsheet_id, frames, layout=["Compile", *([day_tab] if day_tab else [])])
+        if append_only:
+            self._append_to_tab(spreadsheet_id, "Compile", compile_out)
+        self._set_app_property(spreadsheet_id, "upsert_hash", stamp)
+
+    def _upsert_intact(self, spreadsheet_id: str, today_df: pd.DataFrame, day_tab: Optional[str]) -> bool:
+        """
+        Whether the tabs of the last upsert are still there as written: Compile exists
+        and the day tab has exactly today's header + rows. Guards the hash skip against
+        tabs deleted or edited by hand since.
+        """
+        try:
+            tabs = self._worksheets(spreadsheet_id)
+        except Exception as e:
+            self._log(f"upsert_compile: tab lookup failed ({e})")
+            return False
+        if "Compile" not in tabs:
+            return False
+        if not day_tab:
+            return True
+        return day_tab in tabs and self._grid_size(spreadsheet_id, day_tab) == (
+            len(today_df) + 1, max(len(today_df.columns), 1)
+        )
+
+    def _app_property(self, spreadsheet_id: str, key: str) -> Optional[str]:
+        """One Drive appProperties value of the file; None if unset/unavailable."""
+        if self.drive is None:
+            return None
+        try:
+            with self._drive_lock:
+                meta = self.drive.files().get(fileId=spreadsheet_id, fields="appProperties").execute()
+            return (meta.get("appProperties") or {}).get(key)
+        except Exception as e:
+            self._log(f"appProperties lookup failed ({e})")
+            return None
+
+    def _set_app_property(self, spreadsheet_id: str, key: str, value: str) -> None:
+        if self.drive is None:
+            return
+        try:
+            with self._drive_lock:
+                self.drive.files().update(
+                    fileId=spreadsheet_id, body={"appProperties": {key: value}}, fields="id"
+                ).execute()
+        except Exception as e:
+            self._log(f"appProperties update failed ({e})")
+
+    def _plan_compile(
+        self, spreadsheet_id: str, today_df: pd.DataFrame, assign_date_col: str, day_key: Optional[str] = None
+    ) -> Tuple[bool, pd.DataFrame]:
+        """
+        Decide how Compile changes: (True, rows_to_append) when today's rows can simply be
+        appended, else (False, full_new_compile) for a rewrite.
+        An empty today_df still drops the rows dated day_key (a rerun that found nothing).
+        """
         compile_df = self.read_tab_as_df(spreadsheet_id, "Compile")
 
         # If Assign Date is missing, just append raw
         if assign_date_col not in today_df.columns:
             self._log("Assign Date column missing in today_df; writing raw append to Compile.")
-            new_df = pd.concat([compile_df, today_df], ignore_index=True)
+            kept = compile_df
         else:
-            today_val_set = set(str(v) for v in today_df[assign_date_col].astype(str).fillna(""))
-
             if compile_df is not None and not compile_df.empty and assign_date_col in compile_df.columns:
-                mask = ~compile_df[assign_date_col].astype(str).isin(today_val_set)
-                kept = compile_df[mask]
-                # Align columns (union) to avoid column mismatch
-                new_df = pd.concat([kept, today_df], ignore_index=True)
+                today_dates = today_df[assign_date_col]
+                if today_dates.empty and day_key:
+                    today_dates = pd.Series([day_key])
+                mask = ~_same_day_mask(compile_df[assign_date_col], today_dates)
+                kept = compile_df if mask.all() else compile_df.loc[mask]
             else:
                 # No existing Compile or no Assign Date column there — just use today's data
-                new_df = today_df.copy()
+                return False, today_df
+
+        # Nothing to replace and same header -> append only the delta instead of
+        # rebuilding and rewriting the whole (month-long) Compile tab.
+        if kept is compile_df and not compile_df.empty and list(compile_df.columns) == list(today_df.columns):
+            return True, today_df
 
-        self.write_df_to_tab(spreadsheet_id, "Compile", new_df)
+        # Align columns (union) to avoid column mismatch
+        return False, pd.concat([kept, today_df], ignore_index=True)
+
+    def _append_to_tab(self, spreadsheet_id: str, tab_name: str, df: pd.DataFrame) -> None:
+        """Append df's rows (no header) below the tab's existing table in one values.append."""
+        if df.empty:
+            return
+        self._sh(spreadsheet_id).values_append(
+            "'{}'!A1".format(tab_name.replace("'", "''")),
+            params={"valueInputOption": "USER_ENTERED", "insertDataOption": "INSERT_ROWS"},
+            body={"values": _df_to_values(df)[1:]},
+        )
+        _tab_cache_evict(spreadsheet_id, tab_name)
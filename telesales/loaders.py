@@ -17,11 +17,13 @@ Windows:
 
 from __future__ import annotations
 
-from typing import Optional, Tuple
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from datetime import datetime
 import os
-import random
+import zlib
 
+import numpy as np
 import pandas as pd
 
 from .constants import (
@@ -50,35 +52,26 @@ def _inactive_range_for_window(window_label: str) -> Tuple[int, int]:
     return (15, 40)
 
 
-def _gen_last_activity(dmin: int, dmax: int) -> Tuple[datetime, datetime]:
+def _gen_last_activity(rng: np.random.Generator, dmin: int, dmax: int, n: int) -> Tuple[pd.Series, pd.Series]:
     """
-    Generate a (last_login, last_seen) pair such that inactivity is within [dmin, dmax].
+    Generate n (last_login, last_seen) pairs such that inactivity is within [dmin, dmax].
     We keep last_seen >= last_login.
     """
-    days = random.randint(dmin, dmax)
-    base = _today() - timedelta(days=days)
-    last_login = base.replace(hour=10, minute=0, second=0, microsecond=0)
-    last_seen = last_login + timedelta(hours=random.randint(0, 12))
-    return last_login, last_seen
+    days = rng.integers(dmin, dmax + 1, n)
+    base = pd.Timestamp(_today().replace(hour=10, minute=0, second=0, microsecond=0))
+    last_login = base - pd.to_timedelta(days, unit="D")
+    last_seen = last_login + pd.to_timedelta(rng.integers(0, 13, n), unit="h")
+    return pd.Series(last_login), pd.Series(last_seen)
 
 
-def _mock_reward_tier() -> str:
-    return random.choice(["GOLD", "SILVER"])
-
-
-def _mock_tier() -> str:
-    """Rough distribution where some are Tier A and others non‑A."""
-    return random.choice(["A-1", "A-2", "B-1", "B-2", "C-1"])
-
-
-def _mock_phone() -> str:
+def _mock_phones(rng: np.random.Generator, n: int) -> np.ndarray:
     """
-    Generate a Thai‑looking number (10 digits, often starting with 0).
+    Generate Thai‑looking numbers (10 digits, often starting with 0).
     We keep it simple for mocks.
     """
-    start = random.choice(["08", "09", "06"])
-    rest = "".join(random.choice("0123456789") for _ in range(8))
-    return start + rest
+    starts = rng.choice(np.array(["08", "09", "06"]), n)
+    tails = rng.integers(0, 100_000_000, n)
+    return np.char.add(starts, np.char.zfill(tails.astype(str), 8))
 
 
 # ----------------------------- mock loaders -----------------------------------
@@ -86,30 +79,27 @@ def _mock_phone() -> str:
 def _mock_candidates(source_key: str, window_label: str, n: int = 50) -> pd.DataFrame:
     """
     Deterministic‑ish mock set per source+window. Use TEST_SEED to pin results.
+    Each call draws from its own Generator, so concurrent calls don't interfere.
     """
     seed = int(os.getenv("TEST_SEED", "12345"))
-    random.seed(f"{source_key}|{window_label}|{seed}")
+    rng = np.random.default_rng(zlib.crc32(f"{source_key}|{window_label}|{seed}".encode()))
 
     dmin, dmax = _inactive_range_for_window(window_label)
-    rows = []
-    for i in range(1, n + 1):
-        username = f"{source_key}_user{i:03d}"
-        phone = _mock_phone()
-        last_login, last_seen = _gen_last_activity(dmin, dmax)
-        rows.append(
-            {
-                "username": username,
-                "phone": phone,
-                "source_key": source_key,
-                "platform": source_key,  # alias used elsewhere
-                "last_login": last_login,
-                "last_seen": last_seen,
-                "reward_tier": _mock_reward_tier(),   # GOLD/SILVER
-                "tier": _mock_tier(),                 # A‑*, B‑*, C‑*
-                "ark_gem_balance": random.randint(1000, 50000),  # pseudo balance
-            }
-        )
-    return pd.DataFrame(rows)
+    last_login, last_seen = _gen_last_activity(rng, dmin, dmax, n)
+    return pd.DataFrame(
+        {
+            "username": [f"{source_key}_user{i:03d}" for i in range(1, n + 1)],
+            "phone": _mock_phones(rng, n),
+            "source_key": source_key,
+            "platform": source_key,  # alias used elsewhere
+            "last_login": last_login,
+            "last_seen": last_seen,
+            "reward_tier": rng.choice(np.array(["GOLD", "SILVER"]), n),
+            # rough distribution where some are Tier A and others non‑A
+            "tier": rng.choice(np.array(["A-1", "A-2", "B-1", "B-2", "C-1"]), n),
+            "ark_gem_balance": rng.integers(1000, 50001, n),  # pseudo balance
+        }
+    )
 
 
 # ----------------------------- public API -------------------------------------
@@ -139,3 +129,21 @@ def load_candidates_for_window(
     #   df = pd.read_sql(query, engine, params={...})
     # For now, return empty and let the pipeline keep working.
     return pd.DataFrame()
+
+
+def load_candidates_for_windows(
+    jobs: List[Tuple[str, str, Optional[str]]],
+    use_real_db: bool = False,
+) -> List[pd.DataFrame]:
+    """
+    Run load_candidates_for_window for several (source_key, window_label, db_url) jobs,
+    returning the frames in job order.
+    - Real DB: the queries are independent and I/O-bound, so they run concurrently
+      (wall time ~ slowest query instead of the sum).
+    - Mock mode: sequential; generation is cheap and CPU-bound, threads would not help.
+    """
+    if not use_real_db or len(jobs) <= 1:
+        return [load_candidates_for_window(s, w, use_real_db, url) for s, w, url in jobs]
+    with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+        futures = [ex.submit(load_candidates_for_window, s, w, use_real_db, url) for s, w, url in jobs]
+        return [f.result() for f in futures]
@@ -7,8 +7,12 @@ Discord notifications (one message per tier).
 
 from __future__ import annotations
 from typing import Optional
+from urllib.parse import urlparse
+import threading
 import requests
-import json
+
+# One pooled session for all webhook posts in a run (keep-alive: one TLS handshake per host)
+_SESSION = requests.Session()
 
 
 def notify_discord(
@@ -29,6 +33,11 @@ def notify_discord(
     if not webhook_url:
         print(f"[notify] Skipped: webhook not set for {tier_label}.")
         return False
+    parsed = urlparse(webhook_url.strip())
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        # placeholder like "changeme" -> fail fast instead of a DNS lookup / connect timeout
+        print(f"[notify] Skipped: invalid webhook for {tier_label}.")
+        return False
 
     content = (
         f"**Telesales list ready – {tab_name} ({tier_label})**\n"
@@ -39,12 +48,7 @@ def notify_discord(
     )
 
     try:
-        resp = requests.post(
-            webhook_url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps({"content": content}),
-            timeout=10,
-        )
+        resp = _SESSION.post(webhook_url, json={"content": content}, timeout=10)
         if 200 <= resp.status_code < 300:
             print(f"[notify] Sent Discord message for {tier_label} ({row_count} rows).")
             return True
@@ -56,3 +60,15 @@ def notify_discord(
     except requests.RequestException as e:
         print(f"[notify] Error sending Discord message: {e}")
         return False
+
+
+def notify_discord_background(webhook_url: Optional[str], **kwargs) -> threading.Thread:
+    """
+    Fire `notify_discord` on a background thread and return right away.
+
+    The thread is non-daemon on purpose: the pipeline doesn't wait on the webhook,
+    but the interpreter still lets the post finish before the process exits.
+    """
+    t = threading.Thread(target=notify_discord, args=(webhook_url,), kwargs=kwargs, name="notify-discord")
+    t.start()
+    return t
@@ -4,30 +4,29 @@ Rules for windows, dedupe, and re‑query (Non‑A only).
 
 What this provides:
 - tag_window(df, label): adds a 'window_label' column to a DataFrame
+- stack_windows([(label, df), ...]): concat several pools into one tagged pool in one go
 - earlier_window_wins_dedupe(df): keep 1 row per phone; earlier window (Hot < Cold < Hibernated) wins
-- requery_non_a(pools_by_window, target_rows): start from Hot; if short, pull Cold then Hibernated
-- build_non_a_pool(pools_by_window, target_rows): helper that wraps requery + dedupe
-- build_tier_a_pool(pools_by_window): Tier A = Hot only (no re‑query)
+- requery_non_a(pool_df, target_rows): start from Hot; if short, pull Cold then Hibernated
+- build_non_a_pool(pool_df, target_rows): helper that wraps requery + dedupe
+- build_tier_a_pool(pool_df): Tier A = Hot only (no re‑query)
 
 Inputs are plain pandas DataFrames produced by loaders. Each df should have:
   - 'username', 'phone', 'source_key' (or 'platform'), 'last_login'/'last_seen', etc.
-  - After calling tag_window(...), they will also have 'window_label'
+  - After tag_window(...) / stack_windows(...), they will also have 'window_label'
 
-You can wire this into pipeline.py later like:
-  hot_pc  = tag_window(load_candidates_for_window(SOURCE_PC, WINDOW_HOT, ...), WINDOW_HOT)
-  hot_mob = tag_window(load_candidates_for_window(SOURCE_MOBILE, WINDOW_HOT, ...), WINDOW_HOT)
-  cold_pc = tag_window(load_candidates_for_window(SOURCE_PC, WINDOW_COLD, ...), WINDOW_COLD)
-  ... (and so on)
-  pools = {WINDOW_HOT: [hot_pc, hot_mob], WINDOW_COLD: [cold_pc, cold_mob], WINDOW_HIBERNATED: [...]}
+Wiring in pipeline.py looks like:
+  pool = stack_windows([(WINDOW_HOT, hot_pc), (WINDOW_HOT, hot_mob), (WINDOW_COLD, cold_pc), ...])
 
 Then:
-  non_a_rows = build_non_a_pool(pools, target_rows=available_callers * PER_CALLER_TARGET)
-  tier_a_rows = build_tier_a_pool(pools)
+  non_a_rows = build_non_a_pool(pool, target_rows=available_callers * PER_CALLER_TARGET)
+  tier_a_rows = build_tier_a_pool(pool)
 """
 
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
 import pandas as pd
 
 from .constants import (
@@ -38,6 +37,11 @@ from .constants import (
 # Window priority: earlier (hot) wins over later (cold/hibernated)
 WINDOW_PRIORITY: List[str] = [WINDOW_HOT, WINDOW_COLD, WINDOW_HIBERNATED]
 _WINDOW_RANK = {w: i for i, w in enumerate(WINDOW_PRIORITY)}
+_WINDOW_INDEX = pd.Index(WINDOW_PRIORITY)
+
+# Low-cardinality text columns of a stacked pool, stored as categoricals
+# (int codes + one shared dictionary instead of a str ref per row).
+_CATEGORY_COLS = ("source_key", "platform", "tier", "reward_tier")
 
 
 # --------------------------------------------------------------------------- #
@@ -56,16 +60,25 @@ def tag_window(df: pd.DataFrame, label: str) -> pd.DataFrame:
     return out
 
 
-def _concat(pools_by_window: Dict[str, List[pd.DataFrame]]) -> pd.DataFrame:
-    """Concatenate all provided pools (by window) into a single DataFrame."""
-    frames: List[pd.DataFrame] = []
-    for w in WINDOW_PRIORITY:
-        for df in pools_by_window.get(w, []):
-            if isinstance(df, pd.DataFrame) and not df.empty:
-                frames.append(df)
+def stack_windows(tagged: Iterable[Tuple[str, pd.DataFrame]]) -> pd.DataFrame:
+    """
+    Concatenate (window_label, df) pools into ONE DataFrame with 'window_label' set,
+    ordered by window priority (stable within a window). One concat + one column
+    assignment instead of a tag_window copy per pool. Empty/None pools are skipped.
+    window_label and the _CATEGORY_COLS present come back as categoricals.
+    """
+    frames = [(w, df) for w, df in tagged if isinstance(df, pd.DataFrame) and not df.empty]
     if not frames:
         return pd.DataFrame()
-    return pd.concat(frames, ignore_index=True)
+    frames.sort(key=lambda p: _WINDOW_RANK.get(p[0], 9999))
+    pool = pd.concat([df for _, df in frames], ignore_index=True)
+    labels = list(dict.fromkeys(w for w, _ in frames))
+    codes = np.repeat([labels.index(w) for w, _ in frames], [len(df) for _, df in frames])
+    pool["window_label"] = pd.Categorical.from_codes(codes, categories=labels)
+    cats = [c for c in _CATEGORY_COLS if c in pool.columns]
+    if cats:
+        pool = pool.astype({c: "category" for c in cats})
+    return pool
 
 
 def earlier_window_wins_dedupe(df: pd.DataFrame) -> pd.DataFrame:
@@ -77,12 +90,12 @@ def earlier_window_wins_dedupe(df: pd.DataFrame) -> pd.DataFrame:
     if not isinstance(df, pd.DataFrame) or df.empty:
         return pd.DataFrame()
 
-    tmp = df.copy()
-    # Rank windows; unknown windows get a large rank (go to the back)
-    tmp["_win_rank"] = tmp.get("window_label", "").map(lambda w: _WINDOW_RANK.get(str(w), 9999))
-    # Deduplicate by phone: keep the row with the smallest window rank, then first occurrence
-    tmp.sort_values(by=["_win_rank"], kind="stable", inplace=True)
-    deduped = tmp.drop_duplicates(subset=["phone"], keep="first").drop(columns=["_win_rank"])
+    # Rank windows in one get_indexer pass; unknown windows get a large rank (go to the back)
+    labels = df["window_label"].astype(str) if "window_label" in df.columns else pd.Series("", index=df.index)
+    rank = _WINDOW_INDEX.get_indexer(labels)
+    # Stable order by rank (no copy + temp column), then keep the first row per phone
+    ordered = df.take(np.argsort(np.where(rank < 0, 9999, rank), kind="stable"))
+    deduped = ordered[~ordered["phone"].duplicated(keep="first").to_numpy()]
     return deduped.reset_index(drop=True)
 
 
@@ -91,7 +104,7 @@ def earlier_window_wins_dedupe(df: pd.DataFrame) -> pd.DataFrame:
 # --------------------------------------------------------------------------- #
 
 def requery_non_a(
-    pools_by_window: Dict[str, List[pd.DataFrame]],
+    pool_df: pd.DataFrame,
     target_rows: int,
 ) -> Tuple[pd.DataFrame, Dict[str, int]]:
     """
@@ -99,59 +112,54 @@ def requery_non_a(
     Deduplicate phones with earlier_window_wins_dedupe at each step.
     Stop once we reach target_rows or run out of data.
 
+    pool_df is one tagged pool (see stack_windows). Because an earlier window always
+    wins the dedupe, deduping the whole pool once and cutting it by window rank gives
+    the same rows as re-deduping after each window.
+
     Returns (final_df, debug_counts_by_window)
     """
-    # Start with Hot only
-    chosen_frames: List[pd.DataFrame] = []
     counts: Dict[str, int] = {}
+    if not isinstance(pool_df, pd.DataFrame) or pool_df.empty or "window_label" not in pool_df.columns:
+        return pd.DataFrame(), {w: 0 for w in WINDOW_PRIORITY}
 
-    for w in WINDOW_PRIORITY:
-        # Add all pools for this window
-        for df in pools_by_window.get(w, []):
-            if isinstance(df, pd.DataFrame) and not df.empty:
-                chosen_frames.append(df)
-
-        # Concatenate what we have so far and dedupe
-        if chosen_frames:
-            merged = pd.concat(chosen_frames, ignore_index=True)
-        else:
-            merged = pd.DataFrame()
+    deduped = earlier_window_wins_dedupe(pool_df[pool_df["window_label"].isin(WINDOW_PRIORITY)])
+    ranks = _WINDOW_INDEX.get_indexer(deduped["window_label"].astype(str)) if not deduped.empty else np.empty(0)
 
-        deduped = earlier_window_wins_dedupe(merged)
-        counts[w] = len(deduped)
+    for i, w in enumerate(WINDOW_PRIORITY):
+        # rows kept so far = everything up to and including this window
+        counts[w] = int((ranks <= i).sum())
 
         # Check target after every window
-        if len(deduped) >= int(target_rows):
+        if counts[w] >= int(target_rows):
             return deduped.head(int(target_rows)).reset_index(drop=True), counts
 
     # Not enough rows even after Hibernated; return whatever we got
-    return (earlier_window_wins_dedupe(pd.concat(chosen_frames, ignore_index=True))
-            if chosen_frames else pd.DataFrame()), counts
+    return deduped, counts
 
 
 def build_non_a_pool(
-    pools_by_window: Dict[str, List[pd.DataFrame]],
+    pool_df: pd.DataFrame,
     target_rows: int,
 ) -> Tuple[pd.DataFrame, Dict[str, int]]:
     """
     Convenience wrapper around requery_non_a.
     """
-    return requery_non_a(pools_by_window, target_rows=target_rows)
+    return requery_non_a(pool_df, target_rows=target_rows)
 
 
 # --------------------------------------------------------------------------- #
 # Tier A pool (Hot only, no re‑query)
 # --------------------------------------------------------------------------- #
 
-def build_tier_a_pool(pools_by_window: Dict[str, List[pd.DataFrame]]) -> pd.DataFrame:
+def build_tier_a_pool(pool_df: pd.DataFrame) -> pd.DataFrame:
     """
     Tier A uses only HOT window (no re‑query).
-    If multiple sources provide HOT pools, we concat and dedupe by phone with earlier-window wins
+    If multiple sources provide HOT rows, we dedupe by phone with earlier-window wins
     (here all are HOT, so it just keeps first seen).
     """
-    hot_frames = pools_by_window.get(WINDOW_HOT, [])
-    frames = [df for df in hot_frames if isinstance(df, pd.DataFrame) and not df.empty]
-    if not frames:
+    if not isinstance(pool_df, pd.DataFrame) or pool_df.empty or "window_label" not in pool_df.columns:
+        return pd.DataFrame()
+    hot = pool_df[pool_df["window_label"] == WINDOW_HOT]
+    if hot.empty:
         return pd.DataFrame()
-    merged = pd.concat(frames, ignore_index=True)
-    return earlier_window_wins_dedupe(merged)
+    return earlier_window_wins_dedupe(hot)
@@ -1,32 +1,41 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
-from datetime import datetime
 from ..constants import TIER_A_HEADERS, COL_USERNAME, COL_PHONE, COL_TIER, COL_INACTIVE_DAYS, COL_AMOUNT, COL_ARK_GEM, COL_REWARD, COL_ASSIGN_DATE, COL_SOURCE
-from ..utils import today_key, normalize_phone, inactive_days
+from ..utils import today_key, normalize_phone_series, inactive_days_series
 
-def build_tier_a_df(source_rows: pd.DataFrame, ark_gem_col: str) -> pd.DataFrame:
+def build_tier_a_df(source_rows: pd.DataFrame, ark_gem_col: str, day: str | None = None) -> pd.DataFrame:
     if source_rows is None or source_rows.empty:
         return pd.DataFrame(columns=TIER_A_HEADERS)
 
-    phones = source_rows["phone"].map(normalize_phone)
-    inact = source_rows.apply(lambda r: inactive_days(
-        r.get("last_login") if isinstance(r.get("last_login"), datetime) else None,
-        r.get("last_seen") if isinstance(r.get("last_seen"), datetime) else None), axis=1)
+    n = len(source_rows)
+    blank = np.full(n, "", dtype=object)
 
+    def col(name: str) -> np.ndarray:
+        return source_rows[name].to_numpy() if name in source_rows.columns else blank
+
+    # Columns go in as arrays (no per-column Python lists)
     data = {
-        "No.": list(range(1, len(source_rows) + 1)),
-        COL_USERNAME: source_rows["username"].astype(str).tolist(),
-        COL_PHONE: phones.tolist(),
-        COL_TIER: source_rows.get("tier", [""] * len(source_rows)).tolist() if "tier" in source_rows.columns else [""] * len(source_rows),
-        COL_INACTIVE_DAYS: inact.tolist(),
-        COL_AMOUNT: [""] * len(source_rows),
-        COL_ARK_GEM: source_rows.get(ark_gem_col, "").tolist() if ark_gem_col in source_rows.columns else [""] * len(source_rows),
-        COL_REWARD: source_rows.get("reward_tier", "").tolist() if "reward_tier" in source_rows.columns else [""] * len(source_rows),
-        COL_ASSIGN_DATE: [today_key()] * len(source_rows),
+        "No.": np.arange(1, n + 1, dtype=np.int32),
+        COL_USERNAME: source_rows["username"].astype(str).to_numpy(),
+        COL_PHONE: normalize_phone_series(source_rows["phone"]).to_numpy(),
+        COL_TIER: col("tier"),
+        COL_INACTIVE_DAYS: inactive_days_series(source_rows).to_numpy(dtype=np.int32),
+        COL_AMOUNT: blank,
+        COL_ARK_GEM: col(ark_gem_col),
+        COL_REWARD: col("reward_tier"),
+        # one day key per run: a single category, all-zero codes (no N-length string array)
+        COL_ASSIGN_DATE: pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [day or today_key()]),
     }
     if COL_SOURCE in TIER_A_HEADERS:
-        data[COL_SOURCE] = source_rows.get("source_key", "").astype(str).tolist() if "source_key" in source_rows.columns else [""] * len(source_rows)
+        data[COL_SOURCE] = source_rows["source_key"].astype(str).to_numpy() if "source_key" in source_rows.columns else blank
 
     # lock header order
-    df = pd.DataFrame({h: data.get(h, [""] * len(source_rows)) for h in TIER_A_HEADERS})
-    return df[TIER_A_HEADERS]
+    df = pd.DataFrame({h: data.get(h, blank) for h in TIER_A_HEADERS})
+
+    # Low-cardinality text as categoricals (same as the Non-A output)
+    return df.astype({
+        COL_TIER: "category",
+        COL_REWARD: "category",
+        **({COL_SOURCE: "category"} if COL_SOURCE in TIER_A_HEADERS else {}),
+    })
@@ -1,49 +1,37 @@
 from __future__ import annotations
 import pandas as pd
-from dataclasses import dataclass
 from ..config import load_config
-from ..io_gsheets import SheetsClient, SheetsInfo
-from ..constants import SOURCE_PC, SOURCE_MOBILE, WINDOW_HOT, TIER_A_HEADERS, COL_ASSIGN_DATE
+from ..io_gsheets import SheetsClient
+from ..constants import SOURCE_PC, SOURCE_MOBILE, WINDOW_HOT
 from .. import rules, filters
 from ..utils import today_key
 from .build import build_tier_a_df
-from ..loaders import load_candidates_for_window
-from ..notify import notify_discord
+from ..loaders import load_candidates_for_windows
+from ..notify import notify_discord_background
+from .._common import TierWriteResult, write_tier
 
-@dataclass
-class TierWriteResult:
-    tier: str
-    file_name: str
-    tab_name: str
-    row_count: int
-    sheet_url: str
-    spreadsheet_id: str
-
-def _write(sc: SheetsClient, label: str, df: pd.DataFrame) -> TierWriteResult:
-    info: SheetsInfo = sc.find_or_create_month_file(label)
-    day_tab = today_key()
-    sc.ensure_tabs(info.spreadsheet_id, ["Compile", day_tab])
-    sc.write_df_to_tab(info.spreadsheet_id, day_tab, df)
-    sc.upsert_compile(info.spreadsheet_id, df, assign_date_col=COL_ASSIGN_DATE)
-    return TierWriteResult(label, info.title, day_tab, len(df), info.spreadsheet_url, info.spreadsheet_id)
 
 def run() -> TierWriteResult:
     cfg = load_config()
-    sc = SheetsClient(service_account_file=cfg.service_account_file, output_folder_id=cfg.output_folder_id, output_prefix=cfg.output_prefix)
+    day = today_key()  # one day key per run, even if the date rolls over mid-run
+    sc = SheetsClient(service_account_file=cfg.service_account_file, output_folder_id=cfg.output_folder_id, output_prefix=cfg.output_prefix, folder_cache_ttl=cfg.folder_cache_ttl)
 
-    # HOT only; take A-tiers
-    hot_pc  = rules.tag_window(load_candidates_for_window(SOURCE_PC, WINDOW_HOT, cfg.use_real_db, cfg.db_webview_pc or cfg.db_webview), WINDOW_HOT)
-    hot_mob = rules.tag_window(load_candidates_for_window(SOURCE_MOBILE, WINDOW_HOT, cfg.use_real_db, cfg.db_webview_mobile or cfg.db_webview), WINDOW_HOT)
-    a_rows_raw = rules.build_tier_a_pool({WINDOW_HOT: [hot_pc, hot_mob]})
+    # HOT only; A-tiers are masked after the phone dedupe (same order as the combined
+    # pipeline), so a phone also listed under a non-A tier never reaches Tier A
+    jobs = [(SOURCE_PC, WINDOW_HOT, cfg.db_webview_pc or cfg.db_webview),
+            (SOURCE_MOBILE, WINDOW_HOT, cfg.db_webview_mobile or cfg.db_webview)]
+    pool = rules.stack_windows((WINDOW_HOT, df) for df in load_candidates_for_windows(jobs, cfg.use_real_db))
+    a_rows_raw = rules.build_tier_a_pool(pool)
     a_rows_f = filters.apply_filters(
         a_rows_raw, compile_df=None, blacklist_df=pd.DataFrame(), redeemed_usernames_today=[],
+        base_mask=filters.tier_a_mask(a_rows_raw),
         drop_unreachable_repeat=cfg.drop_unreachable_repeat, unreachable_min_count=cfg.unreachable_min_count,
         drop_answered_this_month=cfg.drop_answered_this_month, drop_invalid_number=cfg.drop_invalid_number,
         drop_not_interested_this_month=cfg.drop_not_interested_this_month, drop_not_owner_as_blacklist=cfg.drop_not_owner_as_blacklist,
         drop_redeemed_today=cfg.drop_redeemed_today,
     )
-    df = build_tier_a_df(a_rows_f, ark_gem_col=cfg.ark_gem_column)
-    res = _write(sc, "Tier A", df)
-    if cfg.webhook_a:
-        notify_discord(cfg.webhook_a, tier_label="Tier A", file_name=res.file_name, tab_name=res.tab_name, row_count=res.row_count, sheet_url=res.sheet_url)
+    df = build_tier_a_df(a_rows_f, ark_gem_col=cfg.ark_gem_column, day=day)
+    res = write_tier(sc, "Tier A", df, day_tab=day)
+    if cfg.webhook_a and res.row_count:
+        notify_discord_background(cfg.webhook_a, tier_label="Tier A", file_name=res.file_name, tab_name=res.tab_name, row_count=res.row_count, sheet_url=res.sheet_url)
     return res
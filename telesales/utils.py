@@ -3,6 +3,8 @@
 Small, beginner-friendly helpers:
 - Timezone-aware "now" and today's tab key (DD-MM-YYYY)
 - Phone normalization + Thailand calling-code split
+- Cheap str-casting of pandas columns
+- Column-wise truthy flags (Config/Callers TRUE/yes/1 cells)
 - Inactive Duration (Days) calculation
 """
 
@@ -12,6 +14,9 @@ from zoneinfo import ZoneInfo
 import os
 import re
 
+import numpy as np
+import pandas as pd
+
 # --- Timezone helpers ---------------------------------------------------------
 
 def _app_tz() -> ZoneInfo:
@@ -40,7 +45,51 @@ def normalize_phone(raw: str | int | float | None) -> str:
     """
     if raw is None:
         return ""
-    return _DIGITS.sub("", str(raw))
+    s = str(raw)
+    if s.endswith(".0"):  # float-formatted number (Excel/Sheets import)
+        s = s[:-2]
+    return _DIGITS.sub("", s)
+
+def as_str_series(s: pd.Series) -> pd.Series:
+    """
+    s.astype(str), minus the copy when s already holds only strings
+    (string dtype, or object dtype whose values are all str).
+    """
+    if isinstance(s.dtype, pd.StringDtype):
+        return s
+    if s.dtype == object and pd.api.types.infer_dtype(s, skipna=False) in ("string", "empty"):
+        return s
+    return s.astype(str)
+
+_TRUTHY = frozenset({"1", "1.0", "true", "t", "yes", "y"})
+
+def truthy_series(s: pd.Series) -> pd.Series:
+    """
+    Boolean flag column from sheet cells: numbers are True when non-zero (blank -> False),
+    text when it reads 1/1.0/true/t/yes/y (case and spaces ignored).
+    """
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+        return s.fillna(0).ne(0)
+    return as_str_series(s.fillna("")).str.strip().str.lower().isin(_TRUTHY)
+
+def normalize_phone_series(s: pd.Series) -> pd.Series:
+    """
+    Column-wise normalize_phone (same result per element).
+    Float columns go through Int64 instead of str; the digits-only regex
+    only runs on the rows that actually contain non-digits.
+    """
+    if pd.api.types.is_float_dtype(s):
+        try:
+            ints = s.astype("Int64")
+            return ints.astype(str).where(ints.notna(), "")
+        except (TypeError, ValueError):
+            pass  # non-integral floats -> generic path
+    out = as_str_series(s.where(s.notna(), "")).str.removesuffix(".0")
+    dirty = ~out.str.isdigit()
+    if dirty.any():
+        out = out.copy()
+        out[dirty] = out[dirty].str.replace(_DIGITS, "", regex=True)
+    return out
 
 def split_calling_code_th(local_digits: str) -> tuple[str, str]:
     """
@@ -56,6 +105,12 @@ def split_calling_code_th(local_digits: str) -> tuple[str, str]:
         local = local[1:]
     return "=+66", local
 
+def split_calling_code_th_series(local_digits: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Column-wise split_calling_code_th: ('=+66' per row, digits minus one leading 0)."""
+    digits = local_digits.fillna("")
+    local = digits.where(~digits.str.startswith("0"), digits.str[1:])
+    return pd.Series("=+66", index=digits.index, dtype=object), local
+
 # --- Lead age / inactivity ----------------------------------------------------
 
 # telesales/utils.py (only replace inactive_days)
@@ -82,3 +137,38 @@ def inactive_days(last_login: datetime | None, last_seen: datetime | None) -> in
         base_local = base.astimezone(tz).date()
 
     return (now_local().date() - base_local).days
+
+
+def _local_days(s: pd.Series | None) -> np.ndarray | None:
+    """datetime64 column -> datetime64[D] local calendar days (NaT kept); None if not datetime64."""
+    if s is None:
+        return None
+    if isinstance(s.dtype, pd.DatetimeTZDtype):
+        s = s.dt.tz_convert(_app_tz()).dt.tz_localize(None)
+    elif not pd.api.types.is_datetime64_dtype(s):
+        return None
+    return s.to_numpy().astype("datetime64[D]")
+
+def inactive_days_series(df: pd.DataFrame) -> pd.Series:
+    """
+    Column-wise inactive_days over df['last_login'] / df['last_seen'] (same rules:
+    prefer last_login, fall back to last_seen, -1 if neither). Datetime64 columns are
+    handled with one vectorized subtraction; anything else goes row by row.
+    """
+    n = len(df)
+    login = _local_days(df["last_login"]) if "last_login" in df.columns else np.full(n, "NaT", "datetime64[D]")
+    seen = _local_days(df["last_seen"]) if "last_seen" in df.columns else np.full(n, "NaT", "datetime64[D]")
+    if login is None or seen is None:
+        lg = df["last_login"] if "last_login" in df.columns else pd.Series(None, index=df.index)
+        ls = df["last_seen"] if "last_seen" in df.columns else pd.Series(None, index=df.index)
+        return pd.Series(
+            [
+                inactive_days(a if isinstance(a, datetime) else None, b if isinstance(b, datetime) else None)
+                for a, b in zip(lg, ls)
+            ],
+            index=df.index,
+        )
+    base = np.where(np.isnat(login), seen, login)
+    today = np.datetime64(now_local().date(), "D")
+    days = (today - base).astype(np.int64)
+    return pd.Series(np.where(np.isnat(base), -1, days), index=df.index)
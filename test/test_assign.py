@@ -0,0 +1,54 @@
+import pandas as pd
+from telesales import assign as a
+from telesales.constants import SOURCE_PC, SOURCE_MOBILE
+
+
+def _rows(n_pc, n_mob, n_other=0):
+    src = [SOURCE_PC] * n_pc + [SOURCE_MOBILE] * n_mob + ["other"] * n_other
+    return pd.DataFrame({"username": [f"u{i}" for i in range(len(src))], "source_key": src})
+
+
+def test_equal_counts_and_mix():
+    out = a.assign_mix_aware(_rows(20, 20), ["A", "B"], 8, {SOURCE_PC: 0.5, SOURCE_MOBILE: 0.5})
+    assigned = out[out["telesale"] != ""].astype({"telesale": str})
+    assert assigned["telesale"].value_counts().to_dict() == {"A": 8, "B": 8}
+    per_src = assigned.groupby(["telesale", "source_key"]).size().to_dict()
+    assert all(v == 4 for v in per_src.values())
+
+
+def test_shortage_tops_up_from_other_buckets():
+    out = a.assign_mix_aware(_rows(2, 10, 4), ["A", "B"], 6, {SOURCE_PC: 0.5, SOURCE_MOBILE: 0.5})
+    counts = out.loc[out["telesale"] != "", "telesale"].astype(str).value_counts().to_dict()
+    assert counts == {"A": 6, "B": 6}
+
+
+def test_target_capped_to_equal_share():
+    out = a.assign_mix_aware(_rows(3, 2), ["A", "B"], 80, {})
+    counts = out.loc[out["telesale"] != "", "telesale"].astype(str).value_counts().to_dict()
+    assert counts == {"A": 2, "B": 2}
+    assert (out["telesale"] == "").sum() == 1
+
+
+def test_no_callers_leaves_rows_unassigned():
+    out = a.assign_mix_aware(_rows(2, 2), [], 5, {})
+    assert list(out["telesale"]) == [""] * 4
+
+
+def test_non_default_index_is_preserved():
+    df = _rows(4, 4)
+    df.index = [10 * i for i in range(len(df))]
+    out = a.assign_mix_aware(df, ["A", "B"], 4, {})
+    assert list(out.index) == list(df.index)
+    assert (out["telesale"] != "").sum() == 8
+
+
+def test_hamilton_apportion_largest_remainder():
+    assert a._hamilton_apportion(16, {SOURCE_PC: 0.5, SOURCE_MOBILE: 0.5}) == {SOURCE_PC: 8, SOURCE_MOBILE: 8}
+    assert a._hamilton_apportion(7, {SOURCE_PC: 0.5, SOURCE_MOBILE: 0.5}) == {SOURCE_PC: 4, SOURCE_MOBILE: 3}
+    assert a._hamilton_apportion(0, {SOURCE_PC: 1.0}) == {SOURCE_PC: 0}
+
+
+def test_telesale_is_categorical_over_callers():
+    out = a.assign_mix_aware(_rows(4, 4), ["A", "B", "A"], 2, {})
+    assert isinstance(out["telesale"].dtype, pd.CategoricalDtype)
+    assert list(out["telesale"].cat.categories) == ["", "A", "B"]
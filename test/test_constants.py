@@ -17,9 +17,9 @@ def test_is_tier_a_false_cases():
 
 def test_headers_schema_guard():
     # Tier A headers
-    assert len(c.TIER_A_HEADERS) == 9, "Tier A headers count changed unexpectedly"
+    assert len(c.TIER_A_HEADERS) == 10, "Tier A headers count changed unexpectedly"
     assert len(set(c.TIER_A_HEADERS)) == len(c.TIER_A_HEADERS), "Tier A headers contain duplicates"
 
     # Non-A headers
-    assert len(c.NON_A_HEADERS) == 13, "Non-A headers count changed unexpectedly"
+    assert len(c.NON_A_HEADERS) == 14, "Non-A headers count changed unexpectedly"
     assert len(set(c.NON_A_HEADERS)) == len(c.NON_A_HEADERS), "Non-A headers contain duplicates"
@@ -0,0 +1,65 @@
+import pandas as pd
+from telesales import filters as f
+
+
+def _pool(index=None):
+    return pd.DataFrame(
+        {
+            "username": ["a", "b", "c"],
+            "phone": ["0811", "0822", "0833"],
+            "source_key": ["cabal_pc_th"] * 3,
+        },
+        index=index,
+    )
+
+
+def _compile(rows):
+    return pd.DataFrame(rows, columns=["Username", "Phone Number", "platform", "Answer Status", "Result"])
+
+
+def test_unreachable_repeat_drops_at_threshold():
+    unreachable = sorted(f.UNREACHABLE_ANS_STATUSES)[0]
+    comp = _compile([
+        ["a", "0811", "cabal_pc_th", unreachable, ""],
+        ["a", "0811", "cabal_pc_th", unreachable, ""],
+        ["b", "0822", "cabal_pc_th", unreachable, ""],
+    ])
+    out = f.apply_filters(_pool(), compile_df=comp, unreachable_min_count=2)
+    assert out["username"].tolist() == ["b", "c"]
+
+
+def test_unreachable_counts_align_on_non_default_index():
+    unreachable = sorted(f.UNREACHABLE_ANS_STATUSES)[0]
+    comp = _compile([["zz", "0999", "cabal_pc_th", unreachable, ""]])
+    out = f.apply_filters(_pool(index=[7, 3, 11]), compile_df=comp)
+    assert out["username"].tolist() == ["a", "b", "c"]
+
+
+def test_answered_not_interested_blacklist_and_redeemed():
+    comp = _compile([
+        ["a", "0811", "cabal_pc_th", f.ANSWERED_STATUS, ""],
+        ["b", "0822", "cabal_pc_th", "", f.RESULT_NOT_INTERESTED],
+    ])
+    out = f.apply_filters(_pool(), compile_df=comp)
+    assert out["username"].tolist() == ["c"]
+
+    bl = pd.DataFrame({"username": ["c"], "phone": ["0833"], "source_key": ["cabal_pc_th"]})
+    assert f.apply_filters(_pool(), blacklist_df=bl)["username"].tolist() == ["a", "b"]
+    assert f.apply_filters(_pool(), redeemed_usernames_today={"a"})["username"].tolist() == ["b", "c"]
+
+
+def test_toggles_off_keep_everything():
+    comp = _compile([["a", "0811", "cabal_pc_th", f.ANSWERED_STATUS, f.RESULT_NOT_INTERESTED]])
+    out = f.apply_filters(
+        _pool(), compile_df=comp, redeemed_usernames_today={"b"},
+        drop_answered_this_month=False, drop_not_interested_this_month=False, drop_redeemed_today=False,
+    )
+    assert len(out) == 3
+
+
+def test_base_mask_preselects_rows():
+    pool = _pool().assign(tier=["A-1", "b-2", None])
+    assert f.tier_a_mask(pool).tolist() == [True, False, False]
+    out = f.apply_filters(pool, base_mask=~f.tier_a_mask(pool), redeemed_usernames_today={"b"})
+    assert out["username"].tolist() == ["c"]
+    assert f.apply_filters(pool, base_mask=f.tier_a_mask(pool))["username"].tolist() == ["a"]
@@ -0,0 +1,151 @@
+from types import SimpleNamespace
+
+import pandas as pd
+from telesales import io_gsheets as g
+
+
+class _StubSpreadsheet:
+    def __init__(self, tabs):
+        self.tabs = tabs
+        self.values_gets = 0
+
+    def worksheets(self):
+        return [SimpleNamespace(title=t, id=i, row_count=len(v), col_count=len(v[0]))
+                for i, (t, v) in enumerate(self.tabs.items())]
+
+    def values_get(self, rng):
+        self.values_gets += 1
+        return {"values": self.tabs[rng.strip("'")]}
+
+
+def _client(sh, modified="2025-01-03T00:00:00Z"):
+    sc = g.SheetsClient(service_account_file=None, output_folder_id=None)
+    sc._dry_run_reason = None
+    sc.drive = SimpleNamespace(files=lambda: SimpleNamespace(
+        get=lambda **kw: SimpleNamespace(execute=lambda: {"modifiedTime": modified})
+    ))
+    sc._sh_cache["S"] = sh
+    return sc
+
+
+def test_read_tab_second_read_served_from_cache():
+    g._tab_cache_evict("S", "Compile")
+    sh = _StubSpreadsheet({"Compile": [["Username", "Assign Date"], ["u1", "03-01-2025"]]})
+    sc = _client(sh)
+    first = sc.read_tab_as_df("S", "Compile")
+    second = sc.read_tab_as_df("S", "Compile")
+    assert sh.values_gets == 1
+    assert second.equals(first)
+
+    # a new modifiedTime means the file changed -> live read again
+    _client(sh, modified="2025-01-04T00:00:00Z").read_tab_as_df("S", "Compile")
+    assert sh.values_gets == 2
+    g._tab_cache_evict("S", "Compile")
+
+
+def test_same_day_mask_matches_unpadded_dates():
+    dates = pd.Series(["3-1-2025", "03-01-2025", "04-01-2025", None])
+    assert g._same_day_mask(dates, pd.Series(["03-01-2025"])).tolist() == [True, True, False, False]
+
+
+def test_same_day_mask_unparsed_cells_fall_back_to_string_match():
+    dates = pd.Series(["2025/01/03", "today", "03-01-2025", "2025/01/04"])
+    today = pd.Series(["2025/01/03", "03-01-2025"])
+    assert g._same_day_mask(dates, today).tolist() == [True, False, True, False]
+
+
+def test_same_day_mask_empty_today_matches_nothing():
+    dates = pd.Series(["03-01-2025", "04-01-2025"])
+    assert not g._same_day_mask(dates, pd.Series([], dtype=object)).any()
+
+
+def test_plan_compile_empty_today_uses_day_key():
+    sc = g.SheetsClient(service_account_file=None, output_folder_id=None)
+    compile_df = pd.DataFrame({"Assign Date": ["02-01-2025", "3-1-2025"], "x": [1, 2]})
+    sc.read_tab_as_df = lambda sid, tab: compile_df
+    empty = pd.DataFrame(columns=["Assign Date", "x"])
+    append_only, out = sc._plan_compile("S", empty, "Assign Date", day_key="03-01-2025")
+    assert not append_only
+    assert out["Assign Date"].tolist() == ["02-01-2025"]
+
+
+def test_values_to_tsv_plain_cells():
+    values = g._df_to_values(pd.DataFrame({"a": ["x", "y"], "b": [1, None]}))
+    assert g._values_to_tsv(values) == "a\tb\nx\t1.0\ny\t"
+
+
+def test_values_to_tsv_falls_back_to_json():
+    for cell in ["has\ttab", "two\nlines", "cr\rhere", '"quoted"']:
+        values = g._df_to_values(pd.DataFrame({"a": ["ok"], "b": [cell]}))
+        assert g._values_to_tsv(values) is None, repr(cell)
+    # a quote inside a cell is fine
+    assert g._values_to_tsv([["a"], ['5" pipe']]) == 'a\n5" pipe'
+
+
+def test_df_to_values_escapes_leading_apostrophe():
+    values = g._df_to_values(pd.DataFrame({"p": ["'0812", "0812"]}))
+    assert values == [["p"], ["''0812"], ["0812"]]
+    assert g._values_to_tsv(values) == "p\n''0812\n0812"
+
+
+def _plan(compile_df, today_df, **kw):
+    sc = g.SheetsClient(service_account_file=None, output_folder_id=None)
+    sc.read_tab_as_df = lambda sid, tab: compile_df
+    return sc._plan_compile("S", today_df, "Assign Date", **kw)
+
+
+def test_plan_compile_new_day_same_header_appends():
+    compile_df = pd.DataFrame({"Assign Date": ["02-01-2025"], "x": [1]})
+    today = pd.DataFrame({"Assign Date": ["03-01-2025"], "x": [2]})
+    append_only, out = _plan(compile_df, today)
+    assert append_only
+    assert out.equals(today)
+
+
+def test_plan_compile_rerun_rewrites_without_old_rows():
+    compile_df = pd.DataFrame({"Assign Date": ["02-01-2025", "03-01-2025"], "x": [1, 2]})
+    today = pd.DataFrame({"Assign Date": ["03-01-2025"], "x": [3]})
+    append_only, out = _plan(compile_df, today)
+    assert not append_only
+    assert out["x"].tolist() == [1, 3]
+
+
+def test_plan_compile_header_change_rewrites():
+    compile_df = pd.DataFrame({"Assign Date": ["02-01-2025"], "x": [1]})
+    today = pd.DataFrame({"Assign Date": ["03-01-2025"], "x": [2], "y": ["new"]})
+    append_only, out = _plan(compile_df, today)
+    assert not append_only
+    assert list(out.columns) == ["Assign Date", "x", "y"]
+    assert len(out) == 2
+
+
+def test_plan_compile_missing_assign_date_appends():
+    compile_df = pd.DataFrame({"Username": ["u1"], "x": [1]})
+    today = pd.DataFrame({"Username": ["u2"], "x": [2]})
+    append_only, out = _plan(compile_df, today)
+    assert append_only
+    assert out.equals(today)
+
+
+def test_values_to_df_header_mangling():
+    df = g._values_to_df([["a", "a", "", "a"], ["1", "2", "3", "4"]])
+    assert list(df.columns) == ["a", "a.1", "Unnamed: 2", "a.2"]
+
+
+def test_values_to_df_infers_bools_and_numbers():
+    df = g._values_to_df([["name", "on", "w", "phone"], ["x", "TRUE", "0.5", "0812"], ["y", "false", "1", "0899"]])
+    assert df["on"].tolist() == [True, False] and df["on"].dtype == bool
+    assert df["w"].tolist() == [0.5, 1.0]
+    assert df["phone"].tolist() == [812, 899]  # same as gspread-dataframe: leading zero lost
+    assert df["name"].tolist() == ["x", "y"]
+
+
+def test_values_to_df_pads_short_rows_and_drops_blank_ones():
+    df = g._values_to_df([["a", "b", "c"], ["1"], [], ["x", "y", "z"]])
+    assert len(df) == 2
+    assert df["b"].isna().tolist() == [True, False]
+
+
+def test_values_to_df_blank_header_is_empty():
+    assert g._values_to_df([["", ""], ["1", "2"]]).empty
+    assert g._values_to_df([]).empty
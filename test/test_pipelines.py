@@ -0,0 +1,48 @@
+import pandas as pd
+from telesales import loaders, pipeline
+from telesales.constants import SOURCE_MOBILE, SOURCE_PC, WINDOW_HOT
+from telesales.tier_a import pipeline as tier_a_pipeline
+
+
+def _row(source_key, username, phone, tier):
+    df = loaders._mock_candidates(source_key, WINDOW_HOT, n=1)
+    return df.assign(username=username, phone=phone, tier=tier)
+
+
+# phone X is B-1 on PC and A-1 on mobile; phone Y is A-1 on mobile only
+_FRAMES = {
+    (SOURCE_PC, WINDOW_HOT): _row(SOURCE_PC, "p1", "0812345678", "B-1"),
+    (SOURCE_MOBILE, WINDOW_HOT): pd.concat(
+        [_row(SOURCE_MOBILE, "m1", "0812345678", "A-1"), _row(SOURCE_MOBILE, "m2", "0898765432", "A-1")],
+        ignore_index=True,
+    ),
+}
+
+
+def _fake_load(jobs, use_real_db=False):
+    return [_FRAMES.get((s, w), pd.DataFrame()) for s, w, _ in jobs]
+
+
+def _capture(module, monkeypatch):
+    written = {}
+
+    def fake_write(sc, label, df, *a, **k):
+        written[label] = df
+        return module.TierWriteResult(label, "", "", len(df), "", "")
+
+    monkeypatch.setattr(module, "load_candidates_for_windows", _fake_load)
+    monkeypatch.setattr(module, "write_tier", fake_write)
+    return written
+
+
+def test_tier_a_entrypoint_dedupes_before_tier_mask_like_combined(monkeypatch):
+    monkeypatch.delenv("DISCORD_WEBHOOK_A", raising=False)
+    monkeypatch.delenv("DISCORD_WEBHOOK_NON_A", raising=False)
+    combined = _capture(pipeline, monkeypatch)
+    pipeline.run_mock_hot_only()
+    alone = _capture(tier_a_pipeline, monkeypatch)
+    tier_a_pipeline.run()
+
+    # p1 wins the phone dedupe, so phone X is not Tier A in either path
+    assert combined["Tier A"]["username"].tolist() == ["m2"]
+    assert alone["Tier A"]["username"].tolist() == ["m2"]
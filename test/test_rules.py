@@ -0,0 +1,23 @@
+import pandas as pd
+from telesales import rules
+from telesales.constants import WINDOW_HOT, WINDOW_COLD, WINDOW_HIBERNATED
+
+
+def _df(*phones):
+    return pd.DataFrame({"phone": list(phones), "username": [f"u{p}" for p in phones]})
+
+
+def test_requery_pulls_later_windows_and_earlier_window_wins():
+    pool = rules.stack_windows([
+        (WINDOW_COLD, _df("2", "3")),
+        (WINDOW_HOT, _df("1", "2")),
+        (WINDOW_HIBERNATED, _df("3", "4")),
+    ])
+    out, counts = rules.requery_non_a(pool, target_rows=3)
+    assert counts == {WINDOW_HOT: 2, WINDOW_COLD: 3}
+    assert out["phone"].tolist() == ["1", "2", "3"]
+    assert out["window_label"].tolist() == [WINDOW_HOT, WINDOW_HOT, WINDOW_COLD]
+
+    out, counts = rules.requery_non_a(pool, target_rows=10)
+    assert counts[WINDOW_HIBERNATED] == 4 and len(out) == 4
+    assert rules.build_tier_a_pool(pool)["phone"].tolist() == ["1", "2"]
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from telesales.utils import (
+    inactive_days,
+    inactive_days_series,
+    normalize_phone,
+    normalize_phone_series,
+    now_local,
+    truthy_series,
+)
+
+
+def test_normalize_phone_series_matches_scalar():
+    cases = [
+        pd.Series([934322113.0, np.nan, 812345678.0]),
+        pd.Series(["093-123-4567", None, 934322113.0, "0812 345 678", 42]),
+        pd.Series([812345678, 3]),
+    ]
+    for s in cases:
+        assert normalize_phone_series(s).tolist() == s.map(normalize_phone).tolist()
+    assert normalize_phone(934322113.0) == "934322113"
+
+
+def test_inactive_days_series_matches_scalar():
+    base = now_local().replace(tzinfo=None)
+    df = pd.DataFrame({
+        "last_login": [base - timedelta(days=3), pd.NaT, pd.NaT],
+        "last_seen": [base - timedelta(days=1), base - timedelta(days=9), pd.NaT],
+    })
+    expected = [
+        inactive_days(a if not pd.isna(a) else None, b if not pd.isna(b) else None)
+        for a, b in zip(df["last_login"], df["last_seen"])
+    ]
+    assert inactive_days_series(df).tolist() == expected == [3, 9, -1]
+
+
+def test_truthy_series_text_and_numbers():
+    text = pd.Series(["TRUE", " yes ", "1.0", "t", "0", "no", "", None], dtype=object)
+    assert truthy_series(text).tolist() == [True, True, True, True, False, False, False, False]
+    assert truthy_series(pd.Series([1.0, 0.0, float("nan"), 2.0])).tolist() == [True, False, False, True]